@@ -50,6 +50,10 @@ class CrewPairingBPConfig:
     cols_per_source: int = 5
     time_per_source: float = 0.1
 
+    # Warm start: pairings from a previous CG run (dicts with cost/flights/
+    # arc_indices, or objects with those attributes)
+    initial_columns: Optional[list] = None
+
     # Logging
     verbose: bool = True
 
@@ -141,6 +145,24 @@ def solve_crew_pairing_bp(
             return True
         return False
 
+    # Warm start: seed the pool from a previous CG run so the root node
+    # does not regenerate columns that already exist
+    if config.initial_columns:
+        seeded = 0
+        for p in config.initial_columns:
+            if isinstance(p, dict):
+                cost = p.get('cost', 0.0)
+                flights = set(p.get('flights', ()))
+                arcs = tuple(p.get('arc_indices', ()))
+            else:
+                cost = getattr(p, 'cost', 0.0)
+                flights = set(getattr(p, 'flights', ()))
+                arcs = tuple(getattr(p, 'arc_indices', ()))
+            if flights and add_pairing(cost, flights, arcs):
+                seeded += 1
+        if config.verbose:
+            print(f"Warm-start pairings: {seeded}")
+
     # Create pricing algorithm (will be reused)
     pricing_config = PricingConfig(
         max_columns=config.cg_max_columns,
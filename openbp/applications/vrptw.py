@@ -16,7 +16,7 @@ at each B&B node to find new columns that respect the branching decisions.
 import math
 import time
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from openbp.solver import BPSolution, BPStatus
@@ -51,9 +51,17 @@ class VRPTWBPConfig:
     cg_max_iterations: int = 100
     cg_max_iterations_per_node: int = 50  # CG iterations at each B&B node
 
+    # Warm start: routes (lists of customer indices) from a previous CG run,
+    # seeded into the column pool before the root node is solved
+    initial_columns: Optional[list] = None
+
     # Logging
     verbose: bool = True
 
+    # Optional extras for matrix-aware backends (e.g. extra['soa'] holding a
+    # structure-of-arrays view of the instance for fixed-shape compiled kernels)
+    extra: dict = field(default_factory=dict)
+
 
 def solve_vrptw_bp(
     instance: Any,  # opencg.applications.vrp.VRPTWInstance
@@ -177,6 +185,13 @@ def solve_vrptw_bp(
     if config.verbose:
         print(f"Initial greedy routes: {len(greedy_routes)}")
 
+    # Warm start: reuse columns from a previous CG run instead of
+    # regenerating them at the root node
+    if config.initial_columns:
+        warm = sum(add_route(list(route)) for route in config.initial_columns)
+        if config.verbose:
+            print(f"Warm-start routes: {warm}")
+
     # Node queue: (lower_bound, node_id, depth, rf_decisions)
     node_queue: list[tuple[float, int, int, list[RyanFosterDecision]]] = []
     next_node_id = 0
@@ -15,7 +15,7 @@ For VRPTW, we use:
 import math
 import time
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from itertools import combinations
 from typing import Any, Optional
 
@@ -55,6 +55,9 @@ class VRPTWBPCConfig:
     # Column generation
     cg_max_iterations: int = 100
 
+    # Warm start: routes (lists of customer indices) from a previous CG run
+    initial_columns: Optional[list] = None
+
     # Cutting
     enable_cuts: bool = True
     max_cuts_per_round: int = 10
@@ -64,6 +67,9 @@ class VRPTWBPCConfig:
     # Logging
     verbose: bool = True
 
+    # Optional extras for matrix-aware backends (see VRPTWBPConfig.extra)
+    extra: dict = field(default_factory=dict)
+
 
 def solve_vrptw_bpc(
     instance: Any,  # opencg.applications.vrp.VRPTWInstance
@@ -121,7 +127,9 @@ def solve_vrptw_bpc(
         print("Phase 1: Generating column pool via CG...")
 
     # Run CG to collect all columns
-    all_routes = _collect_all_routes_from_cg(instance, config.cg_max_iterations, config.verbose)
+    all_routes = _collect_all_routes_from_cg(
+        instance, config.cg_max_iterations, config.verbose, config.initial_columns
+    )
 
     if config.verbose:
         print(f"  Column pool size: {len(all_routes)}")
@@ -326,6 +334,7 @@ def _collect_all_routes_from_cg(
     instance,
     max_iterations: int,
     verbose: bool,
+    initial_columns: Optional[list] = None,
 ) -> list[list[int]]:
     """Run column generation and collect ALL generated routes."""
     try:
@@ -385,8 +394,13 @@ def _collect_all_routes_from_cg(
     for route in greedy_routes:
         add_route(route)
 
+    # Warm start: reuse columns from a previous CG run
+    if initial_columns:
+        for route in initial_columns:
+            add_route(list(route))
+
     next_col_id = 0
-    for route in greedy_routes:
+    for route in all_routes:
         col = _create_column_from_route_vrptw(route, instance, network, customer_node_map)
         col = col.with_id(next_col_id)
         next_col_id += 1
@@ -21,6 +21,7 @@ from openbp.branching.arc import ArcBranching
 from openbp.branching.base import (
     BranchingCandidate,
     BranchingStrategy,
+    CandidateBatch,
 )
 from openbp.branching.ryan_foster import RyanFosterBranching
 from openbp.branching.strong import StrongBranching
@@ -29,6 +30,7 @@ from openbp.branching.variable import VariableBranching
 __all__ = [
     "BranchingStrategy",
     "BranchingCandidate",
+    "CandidateBatch",
     "VariableBranching",
     "RyanFosterBranching",
     "ArcBranching",
@@ -53,6 +53,10 @@ class ArcBranching(BranchingStrategy):
     - For required arcs, columns not using the arc have penalty
     """
 
+    # Decision type this strategy's filter consumes; composites use it
+    # to route only the relevant decisions here.
+    branch_type = BranchType.ARC
+
     def __init__(
         self,
         min_arc_value: float = 0.01,
@@ -8,6 +8,8 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Optional
 
+import numpy as np
+
 if TYPE_CHECKING:
     from opencg import Column
 
@@ -38,6 +40,55 @@ class BranchingCandidate:
         return self.score < other.score
 
 
+@dataclass
+class CandidateBatch:
+    """
+    Branching-candidate metadata batched into numpy arrays.
+
+    Row r mirrors candidates[r]; column c its c-th child decision.
+    Callers can assert or score over every candidate with one vectorized
+    comparison instead of a Python loop of attribute reads.
+
+    Attributes:
+        scores: float64[N] candidate scores
+        types: int8[N, D] branch-type codes; -1 pads short decision lists
+        is_upper: bool_[N, D] is_upper_bound per decision
+        bound: float64[N, D] bound_value per decision
+        candidates: the original candidate objects, row-aligned
+    """
+    scores: np.ndarray
+    types: np.ndarray
+    is_upper: np.ndarray
+    bound: np.ndarray
+    candidates: list[BranchingCandidate] = field(default_factory=list)
+
+    @staticmethod
+    def type_code(branch_type) -> int:
+        """Integer code for a BranchType from either backend."""
+        return int(getattr(branch_type, "value", branch_type))
+
+    @classmethod
+    def from_candidates(cls, candidates: list[BranchingCandidate]) -> "CandidateBatch":
+        """Pack a candidate list into parallel arrays."""
+        n = len(candidates)
+        width = max((len(c.decisions) for c in candidates), default=0)
+        scores = np.empty(n, dtype=np.float64)
+        types = np.full((n, width), -1, dtype=np.int8)
+        is_upper = np.zeros((n, width), dtype=np.bool_)
+        bound = np.zeros((n, width), dtype=np.float64)
+        for r, cand in enumerate(candidates):
+            scores[r] = cand.score
+            for c, d in enumerate(cand.decisions):
+                types[r, c] = cls.type_code(d.type)
+                is_upper[r, c] = d.is_upper_bound
+                bound[r, c] = d.bound_value
+        return cls(scores=scores, types=types, is_upper=is_upper,
+                   bound=bound, candidates=candidates)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+
 class BranchingStrategy(ABC):
     """
     Abstract base class for branching strategies.
@@ -58,6 +109,12 @@ class BranchingStrategy(ABC):
     - configure(): Set strategy-specific parameters
     """
 
+    # The BranchType whose decisions this strategy's filter_columns
+    # consumes, or None if it inspects every decision. Composites use
+    # this to route decisions by type instead of letting each strategy
+    # scan and skip the foreign ones.
+    branch_type = None
+
     def __init__(self, name: str = ""):
         """
         Initialize the branching strategy.
@@ -121,6 +178,24 @@ class BranchingStrategy(ABC):
             return None
         return max(candidates, key=lambda c: c.score)
 
+    def select_branching_candidates_batch(
+        self,
+        node: "BPNode",
+        columns: list["Column"],
+        column_values: list[float],
+        duals: dict[int, float],
+    ) -> CandidateBatch:
+        """
+        Batched variant of select_branching_candidates.
+
+        Returns the same candidates with their per-decision metadata
+        packed into numpy arrays (see CandidateBatch), so callers can
+        inspect or rank all candidates with vectorized operations.
+        """
+        return CandidateBatch.from_candidates(
+            self.select_branching_candidates(node, columns, column_values, duals)
+        )
+
     def filter_columns(
         self,
         columns: list["Column"],
@@ -225,9 +300,22 @@ class CompositeBranchingStrategy(BranchingStrategy):
         decisions: list["BranchingDecision"],
     ) -> list["Column"]:
         """Apply all strategies' filters."""
+        # Bucket decisions by type once, then hand each strategy only
+        # the decisions its filter consumes: one dict lookup per
+        # strategy replaces a type-check scan over every decision.
+        by_type: dict = {}
+        for d in decisions:
+            by_type.setdefault(d.type, []).append(d)
+
         result = columns
         for strategy in self.strategies:
-            result = strategy.filter_columns(result, decisions)
+            bt = strategy.branch_type
+            if bt is None:
+                result = strategy.filter_columns(result, decisions)
+            else:
+                relevant = by_type.get(bt)
+                if relevant:
+                    result = strategy.filter_columns(result, relevant)
         return result
 
     def __repr__(self) -> str:
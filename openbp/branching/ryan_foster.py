@@ -60,6 +60,10 @@ class RyanFosterBranching(BranchingStrategy):
       the coverage of i and j.
     """
 
+    # Decision type this strategy's filter consumes; composites use it
+    # to route only the relevant decisions here.
+    branch_type = BranchType.RYAN_FOSTER
+
     def __init__(
         self,
         min_pair_value: float = 0.01,
@@ -212,9 +216,24 @@ class RyanFosterBranching(BranchingStrategy):
 
             i, j = decision.item_i, decision.item_j
             same = decision.same_column
+            pair_mask = (1 << i) | (1 << j)
 
             filtered = []
             for col in result:
+                # Columns carrying a precomputed covered_items bitmask get
+                # a single AND instead of two set-membership tests.
+                mask = getattr(col, "covered_mask", None)
+                if mask is not None:
+                    hit = mask & pair_mask
+                    if same:
+                        # Must have both or neither
+                        if hit == pair_mask or hit == 0:
+                            filtered.append(col)
+                    elif hit != pair_mask:
+                        # Must not have both
+                        filtered.append(col)
+                    continue
+
                 items = col.covered_items
                 has_i = i in items
                 has_j = j in items
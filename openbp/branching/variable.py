@@ -13,7 +13,7 @@ from openbp.branching.base import BranchingCandidate, BranchingStrategy
 try:
     from openbp._core import BranchingDecision, BranchType
 except ImportError:
-    from openbp.core.node import BranchingDecision
+    from openbp.core.node import BranchingDecision, BranchType
 
 
 @dataclass
@@ -43,6 +43,10 @@ class VariableBranching(BranchingStrategy):
     (e.g., Ryan-Foster) is not applicable.
     """
 
+    # Decision type this strategy's filter consumes; composites use it
+    # to route only the relevant decisions here.
+    branch_type = BranchType.VARIABLE
+
     def __init__(
         self,
         min_fractionality: float = 0.01,
@@ -6,10 +6,15 @@ The C++ versions should be preferred for performance.
 """
 
 from openbp.core.node import (
+    ArcDecision,
     BPNode,
     BranchingDecision,
     BranchType,
     NodeStatus,
+    PersistentDecisionList,
+    ResourceDecision,
+    RyanFosterDecision,
+    VariableDecision,
 )
 from openbp.core.selection import (
     BestEstimateSelector,
@@ -26,6 +31,11 @@ __all__ = [
     "NodeStatus",
     "BranchType",
     "BranchingDecision",
+    "VariableDecision",
+    "RyanFosterDecision",
+    "ArcDecision",
+    "ResourceDecision",
+    "PersistentDecisionList",
     "BPTree",
     "TreeStats",
     "NodeSelector",
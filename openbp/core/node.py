@@ -4,31 +4,45 @@ Pure Python implementation of B&P tree nodes.
 This is a fallback when the C++ module is not available.
 """
 
+import itertools
+import sys
+from array import array
 from dataclasses import dataclass, field
-from enum import Enum, auto
+from enum import IntEnum
+from typing import ClassVar, Optional
 
+# Slotted node/decision instances skip the per-instance __dict__: a tree
+# holds one BPNode per explored node and several decisions apiece, so the
+# layout change cuts per-node memory several-fold and makes attribute reads
+# a fixed-offset fetch. dataclass(slots=True) needs Python 3.10; on 3.9
+# (the package floor) the classes keep their dict-based layout.
+_SLOTS_KW = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-class NodeStatus(Enum):
+
+# IntEnum keeps status/type comparisons on the fast integer path and lets
+# downstream code store them in packed int arrays. Values mirror the C++
+# enums in src/core/node.hpp so the two backends stay interchangeable.
+class NodeStatus(IntEnum):
     """Status of a B&P tree node."""
-    PENDING = auto()
-    PROCESSING = auto()
-    BRANCHED = auto()
-    PRUNED_BOUND = auto()
-    PRUNED_INFEASIBLE = auto()
-    INTEGER = auto()
-    FATHOMED = auto()
+    PENDING = 0
+    PROCESSING = 1
+    BRANCHED = 2
+    PRUNED_BOUND = 3
+    PRUNED_INFEASIBLE = 4
+    INTEGER = 5
+    FATHOMED = 6
 
 
-class BranchType(Enum):
+class BranchType(IntEnum):
     """Type of branching decision."""
-    VARIABLE = auto()
-    RYAN_FOSTER = auto()
-    ARC = auto()
-    RESOURCE = auto()
-    CUSTOM = auto()
+    VARIABLE = 0
+    RYAN_FOSTER = 1
+    ARC = 2
+    RESOURCE = 3
+    CUSTOM = 4
 
 
-@dataclass
+@dataclass(**_SLOTS_KW)
 class BranchingDecision:
     """A single branching decision."""
     type: BranchType = BranchType.VARIABLE
@@ -57,40 +71,43 @@ class BranchingDecision:
     custom_int_data: list[int] = field(default_factory=list)
     custom_float_data: list[float] = field(default_factory=list)
 
-    @staticmethod
-    def variable_branch(var_idx: int, value: float, upper: bool) -> "BranchingDecision":
+    # Factories construct in a single call with only the tag's fields set;
+    # decisions are never mutated after creation. Each returns the
+    # per-type subclass so hot consumers can dispatch on the class itself.
+    @classmethod
+    def variable_branch(cls, var_idx: int, value: float, upper: bool) -> "BranchingDecision":
         """Create a variable branching decision."""
-        return BranchingDecision(
+        return VariableDecision(
             type=BranchType.VARIABLE,
             variable_index=var_idx,
             bound_value=value,
             is_upper_bound=upper,
         )
 
-    @staticmethod
-    def ryan_foster(item_i: int, item_j: int, same: bool) -> "BranchingDecision":
+    @classmethod
+    def ryan_foster(cls, item_i: int, item_j: int, same: bool) -> "BranchingDecision":
         """Create a Ryan-Foster branching decision."""
-        return BranchingDecision(
+        return RyanFosterDecision(
             type=BranchType.RYAN_FOSTER,
             item_i=item_i,
             item_j=item_j,
             same_column=same,
         )
 
-    @staticmethod
-    def arc_branch(arc: int, source: int, required: bool) -> "BranchingDecision":
+    @classmethod
+    def arc_branch(cls, arc: int, source: int, required: bool) -> "BranchingDecision":
         """Create an arc branching decision."""
-        return BranchingDecision(
+        return ArcDecision(
             type=BranchType.ARC,
             arc_index=arc,
             source_node=source,
             arc_required=required,
         )
 
-    @staticmethod
-    def resource_branch(res_idx: int, lb: float, ub: float) -> "BranchingDecision":
+    @classmethod
+    def resource_branch(cls, res_idx: int, lb: float, ub: float) -> "BranchingDecision":
         """Create a resource branching decision."""
-        return BranchingDecision(
+        return ResourceDecision(
             type=BranchType.RESOURCE,
             resource_index=res_idx,
             lower_bound=lb,
@@ -98,7 +115,69 @@ class BranchingDecision:
         )
 
 
-@dataclass
+# Per-type subclasses add no state (empty __slots__); they tag each
+# decision at the class level so consumers can dispatch via isinstance
+# or type() keying — a C-level pointer check — instead of reading and
+# comparing the type field.
+class VariableDecision(BranchingDecision):
+    """Variable branching decision."""
+    __slots__ = ()
+
+
+class RyanFosterDecision(BranchingDecision):
+    """Ryan-Foster branching decision."""
+    __slots__ = ()
+
+
+class ArcDecision(BranchingDecision):
+    """Arc branching decision."""
+    __slots__ = ()
+
+
+class ResourceDecision(BranchingDecision):
+    """Resource branching decision."""
+    __slots__ = ()
+
+
+class PersistentDecisionList:
+    """Immutable singly-linked list of branching decisions.
+
+    Children cons their parent's decisions onto a shared tail, so the
+    O(depth) prefix of each lineage is stored once instead of being
+    copied into every sibling. Iteration yields decisions oldest-first,
+    matching the list order all_decisions() has always produced.
+    """
+
+    __slots__ = ("head", "tail", "_len")
+
+    def __init__(self, head: BranchingDecision,
+                 tail: "Optional[PersistentDecisionList]" = None):
+        self.head = head
+        self.tail = tail
+        self._len = 1 if tail is None else tail._len + 1
+
+    @classmethod
+    def extend(cls, base: "Optional[PersistentDecisionList]",
+               decisions) -> "Optional[PersistentDecisionList]":
+        """Cons decisions (oldest-first) onto base; base may be None."""
+        out = base
+        for d in decisions:
+            out = cls(d, out)
+        return out
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self):
+        out = []
+        cur = self
+        while cur is not None:
+            out.append(cur.head)
+            cur = cur.tail
+        return reversed(out)
+
+
+@dataclass(**_SLOTS_KW)
 class BPNode:
     """A node in the branch-and-price tree."""
     id: int = 0
@@ -109,43 +188,105 @@ class BPNode:
     upper_bound: float = float("inf")
     lp_value: float = float("inf")
 
-    status: NodeStatus = NodeStatus.PENDING
+    _status: NodeStatus = NodeStatus.PENDING
     is_integer: bool = False
 
-    inherited_decisions: list[BranchingDecision] = field(default_factory=list)
+    # May hold a plain list or a PersistentDecisionList shared with the
+    # parent lineage; both support len() and oldest-first iteration.
+    inherited_decisions: "list[BranchingDecision] | PersistentDecisionList" = field(default_factory=list)
     local_decisions: list[BranchingDecision] = field(default_factory=list)
-    children: list[int] = field(default_factory=list)
+    # Child IDs as a typed array: 4 bytes per entry instead of a boxed
+    # int apiece, while append and `in` keep their list semantics.
+    children: array = field(default_factory=lambda: array("i"))
 
     solution: list[float] = field(default_factory=list)
     solution_columns: list[int] = field(default_factory=list)
 
+    # (lower_bound, upper_bound, gap) of the last computation; selection
+    # heuristics read gap far more often than the bounds change
+    _gap_state: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
+    # Bumped whenever status changes. Selectors record the epoch at push
+    # time and compare ints on pop, which is cheaper than re-deriving
+    # explorability from the status enum in their inner loops.
+    _epoch: int = field(default=0, init=False, repr=False, compare=False)
+
+    # Memoized inherited + local concatenation; rebuilt after either
+    # list is replaced or appended to through the mutator methods
+    _all_cache: Optional[list] = field(default=None, init=False, repr=False, compare=False)
+
+    # Freelist of released instances; reusing them skips allocation and
+    # keeps the slot storage warm across solves. Bounded so a huge tree
+    # torn down at once cannot pin memory indefinitely.
+    _free: ClassVar[list] = []
+    _FREE_MAX: ClassVar[int] = 65536
+
+    @classmethod
+    def acquire(cls, **kwargs) -> "BPNode":
+        """Get a node from the freelist, or allocate a fresh one."""
+        if cls._free:
+            node = cls._free.pop()
+            node.__init__(**kwargs)
+            return node
+        return cls(**kwargs)
+
+    @classmethod
+    def release(cls, node: "BPNode") -> None:
+        """Return a node to the freelist for reuse.
+
+        The caller must not hold references to the node afterwards; its
+        contents are reset immediately so released solutions and decision
+        lists can be collected.
+        """
+        if len(cls._free) < cls._FREE_MAX:
+            node.__init__()
+            cls._free.append(node)
+
     @property
     def gap(self) -> float:
-        """Compute optimality gap."""
+        """Compute optimality gap (cached until either bound changes)."""
+        state = self._gap_state
+        if (state is not None
+                and state[0] == self.lower_bound
+                and state[1] == self.upper_bound):
+            return state[2]
         if self.upper_bound == float("inf") or self.lower_bound == float("-inf"):
-            return float("inf")
-        if self.upper_bound == 0.0:
-            return 0.0 if self.lower_bound == 0.0 else float("inf")
-        return (self.upper_bound - self.lower_bound) / abs(self.upper_bound)
+            g = float("inf")
+        elif self.upper_bound == 0.0:
+            g = 0.0 if self.lower_bound == 0.0 else float("inf")
+        else:
+            g = (self.upper_bound - self.lower_bound) / abs(self.upper_bound)
+        self._gap_state = (self.lower_bound, self.upper_bound, g)
+        return g
+
+    @property
+    def status(self) -> NodeStatus:
+        """Node status."""
+        return self._status
+
+    @status.setter
+    def status(self, value: NodeStatus) -> None:
+        if value != self._status:
+            self._status = value
+            self._epoch += 1
 
     @property
     def is_processed(self) -> bool:
         """Whether node has been processed."""
-        return self.status not in (NodeStatus.PENDING, NodeStatus.PROCESSING)
+        return self._status >= NodeStatus.BRANCHED
 
     @property
     def is_pruned(self) -> bool:
         """Whether node has been pruned."""
-        return self.status in (
-            NodeStatus.PRUNED_BOUND,
-            NodeStatus.PRUNED_INFEASIBLE,
-            NodeStatus.FATHOMED,
-        )
+        # Pruned statuses are 3, 4 and 6 in the shared ordering: two int
+        # compares instead of a tuple membership scan.
+        return (self._status >= NodeStatus.PRUNED_BOUND
+                and self._status != NodeStatus.INTEGER)
 
     @property
     def can_be_explored(self) -> bool:
         """Whether node can still be explored."""
-        return self.status == NodeStatus.PENDING
+        return self._status == NodeStatus.PENDING
 
     @property
     def has_children(self) -> bool:
@@ -163,12 +304,25 @@ class BPNode:
         return len(self.inherited_decisions) + len(self.local_decisions)
 
     def all_decisions(self) -> list[BranchingDecision]:
-        """Get all branching decisions."""
-        return self.inherited_decisions + self.local_decisions
+        """Get all branching decisions.
+
+        The returned list is cached and shared between calls; treat it
+        as read-only.
+        """
+        out = self._all_cache
+        if out is None:
+            out = [*self.inherited_decisions, *self.local_decisions]
+            self._all_cache = out
+        return out
+
+    def iter_all_decisions(self):
+        """Iterate all branching decisions without building a list."""
+        return itertools.chain(self.inherited_decisions, self.local_decisions)
 
     def add_local_decision(self, decision: BranchingDecision) -> None:
         """Add a local branching decision."""
         self.local_decisions.append(decision)
+        self._all_cache = None
 
     def add_child(self, child_id: int) -> None:
         """Add a child node ID."""
@@ -192,3 +346,4 @@ class BPNode:
     def set_inherited_decisions(self, decisions: list[BranchingDecision]) -> None:
         """Set inherited decisions."""
         self.inherited_decisions = decisions
+        self._all_cache = None
@@ -73,49 +73,78 @@ class BestFirstSelector(NodeSelector):
     """Best-first (best-bound) node selection."""
 
     def __init__(self):
-        self._heap: list[tuple] = []  # (bound, id, node)
+        self._heap: list[tuple] = []  # (bound, id, epoch, node)
         self._counter = 0
 
     def add_node(self, node: BPNode) -> None:
         if node and node.can_be_explored:
-            heapq.heappush(self._heap, (node.lower_bound, self._counter, node))
+            heapq.heappush(
+                self._heap, (node.lower_bound, self._counter, node._epoch, node)
+            )
             self._counter += 1
 
+    def add_nodes(self, nodes: list[BPNode]) -> None:
+        heap = self._heap
+        count = self._counter
+        entries = []
+        for node in nodes:
+            if node and node.can_be_explored:
+                entries.append((node.lower_bound, count, node._epoch, node))
+                count += 1
+        self._counter = count
+        # One O(n) heapify beats k sift-ups only for batches that are
+        # large relative to the heap; small batches are pushed normally.
+        if len(entries) * 8 >= len(heap) + len(entries):
+            heap.extend(entries)
+            heapq.heapify(heap)
+        else:
+            for entry in entries:
+                heapq.heappush(heap, entry)
+
     def select_next(self) -> Optional[BPNode]:
-        self.prune()
+        # Lazy deletion: entries whose node changed status since the push
+        # (epoch mismatch, a single int compare) are skipped as they
+        # surface instead of rebuilding the heap on every select.
         while self._heap:
-            _, _, node = heapq.heappop(self._heap)
-            if node.can_be_explored:
+            _, _, epoch, node = heapq.heappop(self._heap)
+            if node._epoch == epoch:
                 return node
         return None
 
     def peek_next(self) -> Optional[BPNode]:
-        while self._heap:
-            if self._heap[0][2].can_be_explored:
-                return self._heap[0][2]
-            heapq.heappop(self._heap)
+        self._discard_stale()
+        if self._heap:
+            return self._heap[0][3]
         return None
 
+    def _discard_stale(self) -> None:
+        """Pop lazily-deleted (stale-epoch) entries off the heap top."""
+        while self._heap and self._heap[0][3]._epoch != self._heap[0][2]:
+            heapq.heappop(self._heap)
+
     def empty(self) -> bool:
         return len(self._heap) == 0
 
     def size(self) -> int:
+        # May include entries awaiting lazy deletion; call prune() first
+        # for an exact count.
         return len(self._heap)
 
     def prune(self) -> int:
-        valid = [(b, c, n) for b, c, n in self._heap if n.can_be_explored]
+        valid = [(b, c, e, n) for b, c, e, n in self._heap if n._epoch == e]
         removed = len(self._heap) - len(valid)
         self._heap = valid
         heapq.heapify(self._heap)
         return removed
 
     def best_bound(self) -> float:
+        self._discard_stale()
         if not self._heap:
             return float("inf")
         return self._heap[0][0]
 
     def get_open_node_ids(self) -> list[int]:
-        return [n.id for _, _, n in self._heap]
+        return [n.id for _, _, e, n in self._heap if n._epoch == e]
 
     def clear(self) -> None:
         self._heap = []
@@ -125,26 +154,48 @@ class DepthFirstSelector(NodeSelector):
     """Depth-first node selection."""
 
     def __init__(self):
-        self._heap: list[tuple] = []  # (-depth, bound, id, node)
+        self._heap: list[tuple] = []  # (-depth, bound, id, epoch, node)
         self._counter = 0
 
     def add_node(self, node: BPNode) -> None:
         if node and node.can_be_explored:
-            heapq.heappush(self._heap, (-node.depth, node.lower_bound, self._counter, node))
+            heapq.heappush(
+                self._heap,
+                (-node.depth, node.lower_bound, self._counter, node._epoch, node),
+            )
             self._counter += 1
 
+    def add_nodes(self, nodes: list[BPNode]) -> None:
+        heap = self._heap
+        count = self._counter
+        entries = []
+        for node in nodes:
+            if node and node.can_be_explored:
+                entries.append(
+                    (-node.depth, node.lower_bound, count, node._epoch, node)
+                )
+                count += 1
+        self._counter = count
+        if len(entries) * 8 >= len(heap) + len(entries):
+            heap.extend(entries)
+            heapq.heapify(heap)
+        else:
+            for entry in entries:
+                heapq.heappush(heap, entry)
+
     def select_next(self) -> Optional[BPNode]:
-        self.prune()
+        # Lazy deletion, as in BestFirstSelector: stale-epoch entries are
+        # skipped as they surface rather than rebuilding the heap first.
         while self._heap:
-            _, _, _, node = heapq.heappop(self._heap)
-            if node.can_be_explored:
+            _, _, _, epoch, node = heapq.heappop(self._heap)
+            if node._epoch == epoch:
                 return node
         return None
 
     def peek_next(self) -> Optional[BPNode]:
         while self._heap:
-            if self._heap[0][3].can_be_explored:
-                return self._heap[0][3]
+            if self._heap[0][4]._epoch == self._heap[0][3]:
+                return self._heap[0][4]
             heapq.heappop(self._heap)
         return None
 
@@ -152,22 +203,25 @@ class DepthFirstSelector(NodeSelector):
         return len(self._heap) == 0
 
     def size(self) -> int:
+        # May include entries awaiting lazy deletion; call prune() first
+        # for an exact count.
         return len(self._heap)
 
     def prune(self) -> int:
-        valid = [(d, b, c, n) for d, b, c, n in self._heap if n.can_be_explored]
+        valid = [(d, b, c, e, n) for d, b, c, e, n in self._heap if n._epoch == e]
         removed = len(self._heap) - len(valid)
         self._heap = valid
         heapq.heapify(self._heap)
         return removed
 
     def best_bound(self) -> float:
-        if not self._heap:
-            return float("inf")
-        return min(b for _, b, _, _ in self._heap)
+        return min(
+            (b for _, b, _, e, n in self._heap if n._epoch == e),
+            default=float("inf"),
+        )
 
     def get_open_node_ids(self) -> list[int]:
-        return [n.id for _, _, _, n in self._heap]
+        return [n.id for _, _, _, e, n in self._heap if n._epoch == e]
 
     def clear(self) -> None:
         self._heap = []
@@ -177,29 +231,91 @@ class BestEstimateSelector(NodeSelector):
     """Best-estimate node selection."""
 
     def __init__(self, estimate_weight: float = 0.5):
-        self._nodes: list[BPNode] = []
+        # (estimate, id, epoch, lb, depth, node); lb/depth are captured
+        # at push time so re-scoring never re-reads node attributes
+        self._heap: list[tuple] = []
         self._estimate_weight = estimate_weight
         self._global_upper = float("inf")
         self._max_depth = 1
+        # Estimates stored in the heap depend on the incumbent and max
+        # depth; when either changes materially the heap is rebuilt once,
+        # lazily, instead of re-scoring on every select.
+        self._dirty = False
 
     def add_node(self, node: BPNode) -> None:
         if node and node.can_be_explored:
-            self._nodes.append(node)
-            self._max_depth = max(self._max_depth, node.depth)
+            if node.depth > self._max_depth:
+                self._max_depth = node.depth
+                if self._global_upper != float("inf"):
+                    self._dirty = True
+            heapq.heappush(
+                self._heap,
+                (self._estimate(node), node.id, node._epoch,
+                 node.lower_bound, node.depth, node),
+            )
 
-    def select_next(self) -> Optional[BPNode]:
-        self.prune()
-        if not self._nodes:
-            return None
+    def add_nodes(self, nodes: list[BPNode]) -> None:
+        entries = []
+        for node in nodes:
+            if node and node.can_be_explored:
+                if node.depth > self._max_depth:
+                    self._max_depth = node.depth
+                    if self._global_upper != float("inf"):
+                        self._dirty = True
+                entries.append(
+                    (self._estimate(node), node.id, node._epoch,
+                     node.lower_bound, node.depth, node)
+                )
+        heap = self._heap
+        if self._dirty:
+            # The pending rebuild will heapify anyway.
+            heap.extend(entries)
+        elif len(entries) * 8 >= len(heap) + len(entries):
+            heap.extend(entries)
+            heapq.heapify(heap)
+        else:
+            for entry in entries:
+                heapq.heappush(heap, entry)
+
+    def _reheapify(self) -> None:
+        """Re-score every queued node and rebuild the heap."""
+        # Inline the estimate over the captured (lb, depth) pairs: one
+        # multiply-add per entry, no method calls or attribute reads.
+        w = self._estimate_weight
+        ub = self._global_upper
+        if ub == float("inf"):
+            self._heap = [
+                (lb - w * d, i, e, lb, d, n)
+                for _, i, e, lb, d, n in self._heap
+                if n._epoch == e
+            ]
+        else:
+            inv_md = 1.0 / max(1, self._max_depth)
+            self._heap = [
+                (lb + w * (1.0 - d * inv_md) * (ub - lb), i, e, lb, d, n)
+                for _, i, e, lb, d, n in self._heap
+                if n._epoch == e
+            ]
+        heapq.heapify(self._heap)
+        self._dirty = False
 
-        best_idx = min(range(len(self._nodes)), key=lambda i: self._estimate(self._nodes[i]))
-        node = self._nodes.pop(best_idx)
-        return node
+    def select_next(self) -> Optional[BPNode]:
+        if self._dirty:
+            self._reheapify()
+        while self._heap:
+            _, _, epoch, _, _, node = heapq.heappop(self._heap)
+            if node._epoch == epoch:
+                return node
+        return None
 
     def peek_next(self) -> Optional[BPNode]:
-        if not self._nodes:
-            return None
-        return min(self._nodes, key=self._estimate)
+        if self._dirty:
+            self._reheapify()
+        while self._heap and self._heap[0][5]._epoch != self._heap[0][2]:
+            heapq.heappop(self._heap)
+        if self._heap:
+            return self._heap[0][5]
+        return None
 
     def _estimate(self, node: BPNode) -> float:
         lb = node.lower_bound
@@ -210,29 +326,37 @@ class BestEstimateSelector(NodeSelector):
         return lb + self._estimate_weight * (1.0 - depth_ratio) * gap
 
     def empty(self) -> bool:
-        return len(self._nodes) == 0
+        return len(self._heap) == 0
 
     def size(self) -> int:
-        return len(self._nodes)
+        return len(self._heap)
 
     def prune(self) -> int:
-        old_size = len(self._nodes)
-        self._nodes = [n for n in self._nodes if n.can_be_explored]
-        return old_size - len(self._nodes)
+        valid = [t for t in self._heap if t[5]._epoch == t[2]]
+        removed = len(self._heap) - len(valid)
+        self._heap = valid
+        heapq.heapify(self._heap)
+        return removed
 
     def on_bound_update(self, new_bound: float) -> None:
-        self._global_upper = new_bound
+        # inf - inf is nan, which fails the comparison: identical or
+        # still-infinite incumbents leave the heap untouched.
+        if abs(new_bound - self._global_upper) > 1e-9:
+            self._global_upper = new_bound
+            self._dirty = True
 
     def best_bound(self) -> float:
-        if not self._nodes:
-            return float("inf")
-        return min(n.lower_bound for n in self._nodes)
+        return min(
+            (lb for _, _, e, lb, _, n in self._heap if n._epoch == e),
+            default=float("inf"),
+        )
 
     def get_open_node_ids(self) -> list[int]:
-        return [n.id for n in self._nodes]
+        return [i for _, i, e, _, _, n in self._heap if n._epoch == e]
 
     def clear(self) -> None:
-        self._nodes = []
+        self._heap = []
+        self._dirty = False
 
 
 class HybridSelector(NodeSelector):
@@ -252,11 +376,18 @@ class HybridSelector(NodeSelector):
             self._best_first.add_node(node)
             self._depth_first.add_node(node)
 
+    def add_nodes(self, nodes: list[BPNode]) -> None:
+        self._best_first.add_nodes(nodes)
+        self._depth_first.add_nodes(nodes)
+
     def select_next(self) -> Optional[BPNode]:
         if not self._diving and self._nodes_since_dive >= self._dive_frequency:
             self._diving = True
             self._current_dive_depth = 0
 
+        # Both child heaps mirror the open set; the one not being popped
+        # from sheds entries for already-processed nodes lazily, so mode
+        # switches never trigger a rebuild of either heap.
         if self._diving:
             node = self._depth_first.select_next()
             if node:
@@ -264,12 +395,10 @@ class HybridSelector(NodeSelector):
                 if self._current_dive_depth >= self._dive_depth:
                     self._diving = False
                     self._nodes_since_dive = 0
-                self._best_first.prune()
                 return node
             self._diving = False
 
         self._nodes_since_dive += 1
-        self._depth_first.prune()
         return self._best_first.select_next()
 
     def peek_next(self) -> Optional[BPNode]:
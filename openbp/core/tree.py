@@ -4,10 +4,18 @@ Pure Python implementation of B&P tree.
 This is a fallback when the C++ module is not available.
 """
 
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field
 from typing import Callable, Optional
 
-from openbp.core.node import BPNode, BranchingDecision, NodeStatus
+import numpy as np
+
+from openbp.core.node import (
+    BPNode,
+    BranchingDecision,
+    NodeStatus,
+    PersistentDecisionList,
+)
 
 
 @dataclass
@@ -24,13 +32,28 @@ class TreeStats:
     best_lower_bound: float = float("-inf")
     best_upper_bound: float = float("inf")
 
+    # (best_lower_bound, best_upper_bound, gap) of the last computation
+    _gap_state: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+
     def gap(self) -> float:
-        """Current optimality gap."""
-        if self.best_upper_bound == float("inf") or self.best_lower_bound == float("-inf"):
-            return float("inf")
-        if abs(self.best_upper_bound) < 1e-10:
-            return 0.0 if abs(self.best_lower_bound) < 1e-10 else float("inf")
-        return (self.best_upper_bound - self.best_lower_bound) / abs(self.best_upper_bound)
+        """Current optimality gap (cached until either bound changes)."""
+        state = self._gap_state
+        if (state is not None
+                and state[0] == self.best_lower_bound
+                and state[1] == self.best_upper_bound):
+            return state[2]
+        ub = self.best_upper_bound
+        lb = self.best_lower_bound
+        if math.isinf(ub) or math.isinf(lb):
+            g = float("inf")
+        elif ub == lb == 0.0:
+            g = 0.0
+        else:
+            # Branchless core: the epsilon in the denominator absorbs the
+            # ub-near-zero case instead of a separate test for it.
+            g = abs(ub - lb) / (abs(ub) + 1e-10)
+        self._gap_state = (lb, ub, g)
+        return g
 
 
 class BPTree:
@@ -44,7 +67,9 @@ class BPTree:
             minimize: True for minimization, False for maximization
         """
         self._minimize = minimize
-        self._nodes: dict[int, BPNode] = {}
+        # IDs are dense (assigned sequentially by create_child), so a list
+        # indexed by ID beats a dict lookup and keeps nodes contiguous.
+        self._nodes: list[BPNode] = []
         self._next_id = 0
         self._global_lower_bound = float("-inf")
         self._global_upper_bound = float("inf")
@@ -52,9 +77,16 @@ class BPTree:
         self._stats = TreeStats()
 
         # Create root node
-        self._root = BPNode(id=self._next_id)
+        # One flag per node ID: set while the node may still be open.
+        # Cleared by mark_processed/prune_by_bound; a direct status write
+        # that bypasses the tree leaves a stale bit, which readers filter
+        # out, so the bitmap only ever over-approximates the open set.
+        self._open = np.zeros(1024, dtype=bool)
+
+        self._root = BPNode.acquire(id=self._next_id)
         self._next_id += 1
-        self._nodes[self._root.id] = self._root
+        self._nodes.append(self._root)
+        self._open[self._root.id] = True
         self._stats.nodes_created = 1
         self._stats.nodes_open = 1
 
@@ -69,11 +101,13 @@ class BPTree:
 
     def node(self, node_id: int) -> Optional[BPNode]:
         """Get a node by ID."""
-        return self._nodes.get(node_id)
+        if 0 <= node_id < len(self._nodes):
+            return self._nodes[node_id]
+        return None
 
     def has_node(self, node_id: int) -> bool:
         """Check if a node exists."""
-        return node_id in self._nodes
+        return 0 <= node_id < len(self._nodes)
 
     @property
     def num_nodes(self) -> int:
@@ -86,7 +120,7 @@ class BPTree:
         decision: BranchingDecision,
     ) -> BPNode:
         """Create a child node."""
-        child = BPNode(
+        child = BPNode.acquire(
             id=self._next_id,
             parent_id=parent.id,
             depth=parent.depth + 1,
@@ -94,11 +128,13 @@ class BPTree:
             upper_bound=parent.upper_bound,
         )
         child.local_decisions = [decision]
-        child.inherited_decisions = parent.all_decisions()
+        child.set_inherited_decisions(self._inherited_chain(parent))
 
         self._next_id += 1
         parent.add_child(child.id)
-        self._nodes[child.id] = child
+        self._nodes.append(child)
+        self._grow_open(child.id + 1)
+        self._open[child.id] = True
 
         self._stats.nodes_created += 1
         self._stats.nodes_open += 1
@@ -107,15 +143,73 @@ class BPTree:
 
         return child
 
+    def _inherited_chain(self, parent: BPNode):
+        """Decision chain a child of this parent inherits.
+
+        Children share the parent's decision prefix structurally: the
+        parent's (converted-once) chain is extended by its local
+        decisions, costing O(local) cells per child instead of copying
+        the O(depth) stack into each sibling.
+        """
+        base = parent.inherited_decisions
+        if isinstance(base, list):
+            base = PersistentDecisionList.extend(None, base)
+            if base is not None:
+                parent.inherited_decisions = base
+        chain = PersistentDecisionList.extend(base, parent.local_decisions)
+        return chain if chain is not None else []
+
+    def _grow_open(self, needed: int) -> None:
+        """Ensure the open bitmap covers at least `needed` node IDs."""
+        size = self._open.size
+        if needed <= size:
+            return
+        while size < needed:
+            size *= 2
+        grown = np.zeros(size, dtype=bool)
+        grown[: self._open.size] = self._open
+        self._open = grown
+
     def create_children(
         self,
         parent: BPNode,
         decisions: list[BranchingDecision],
     ) -> list[BPNode]:
         """Create multiple children."""
-        children = [self.create_child(parent, d) for d in decisions]
+        # Batched sibling creation: the inherited chain, bitmap growth
+        # and stats updates are paid once for the whole batch rather
+        # than once per child.
+        k = len(decisions)
+        inherited = self._inherited_chain(parent)
+        start = self._next_id
+        end = start + k
+        self._grow_open(end)
+        depth = parent.depth + 1
+
+        children = []
+        for offset, decision in enumerate(decisions):
+            child = BPNode.acquire(
+                id=start + offset,
+                parent_id=parent.id,
+                depth=depth,
+                lower_bound=parent.lower_bound,
+                upper_bound=parent.upper_bound,
+            )
+            child.local_decisions = [decision]
+            child.set_inherited_decisions(inherited)
+            parent.add_child(child.id)
+            self._nodes.append(child)
+            children.append(child)
+
+        self._next_id = end
+        self._open[start:end] = True
+        self._stats.nodes_created += k
+        self._stats.nodes_open += k
+        if k and depth > self._stats.max_depth:
+            self._stats.max_depth = depth
 
         parent.status = NodeStatus.BRANCHED
+        self._open[parent.id] = False
         self._stats.nodes_branched += 1
         self._stats.nodes_open -= 1
 
@@ -125,6 +219,8 @@ class BPTree:
         """Mark a node as processed."""
         old_status = node.status
         node.status = new_status
+        if new_status != NodeStatus.PENDING:
+            self._open[node.id] = False
 
         if old_status in (NodeStatus.PENDING, NodeStatus.PROCESSING):
             self._stats.nodes_processed += 1
@@ -176,24 +272,44 @@ class BPTree:
         """Compute lower bound from open nodes."""
         lb = self._global_upper_bound
         for node_id in open_node_ids:
-            node = self._nodes.get(node_id)
+            node = self.node(node_id)
             if node and node.can_be_explored:
                 lb = min(lb, node.lower_bound)
         return lb
 
     def prune_by_bound(self) -> int:
         """Prune all nodes by bound."""
-        pruned = 0
-        for node in self._nodes.values():
-            if node.can_be_explored and node.try_prune_by_bound(self._global_upper_bound):
-                self._stats.nodes_pruned_bound += 1
-                self._stats.nodes_open -= 1
-                pruned += 1
+        nodes = self._nodes
+        # The open bitmap narrows the sweep to candidate IDs before any
+        # per-node attribute reads; bounds and status of the candidates
+        # are then compared vectorized, and only the (typically few)
+        # hits go back through Python to flip their status.
+        open_ids = np.flatnonzero(self._open[: len(nodes)])
+        if open_ids.size == 0:
+            return 0
+        lb = np.fromiter(
+            (nodes[i].lower_bound for i in open_ids),
+            dtype=np.float64, count=open_ids.size,
+        )
+        is_open = np.fromiter(
+            (nodes[i]._status == NodeStatus.PENDING for i in open_ids),
+            dtype=np.bool_, count=open_ids.size,
+        )
+        hits = open_ids[is_open & (lb >= self._global_upper_bound - 1e-6)]
+        for i in hits:
+            nodes[i].status = NodeStatus.PRUNED_BOUND
+        self._open[hits] = False
+        pruned = int(hits.size)
+        self._stats.nodes_pruned_bound += pruned
+        self._stats.nodes_open -= pruned
         return pruned
 
     def get_open_nodes(self) -> list[int]:
         """Get IDs of all open nodes."""
-        return [n.id for n in self._nodes.values() if n.can_be_explored]
+        nodes = self._nodes
+        candidates = np.flatnonzero(self._open[: len(nodes)])
+        # Stale bits (status set directly on the node) are filtered here.
+        return [int(i) for i in candidates if nodes[i].can_be_explored]
 
     @property
     def is_complete(self) -> bool:
@@ -226,20 +342,21 @@ class BPTree:
 
     def get_path_to_root(self, target_id: int) -> list[int]:
         """Get node IDs from root to target."""
+        # Tight ancestor chase: bind the node list and bound locally so
+        # each hop is one index plus one attribute read.
+        nodes = self._nodes
+        count = len(nodes)
         path = []
         current = target_id
 
-        while current != -1:
+        while 0 <= current < count:
             path.append(current)
-            node = self._nodes.get(current)
-            if node is None:
-                break
-            current = node.parent_id
+            current = nodes[current].parent_id
 
         path.reverse()
         return path
 
     def for_each_node(self, callback: Callable[[BPNode], None]) -> None:
         """Iterate over all nodes."""
-        for node in self._nodes.values():
+        for node in self._nodes:
             callback(node)
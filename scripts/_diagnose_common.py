@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Shared setup for the diagnose_* scripts.
+
+Each diagnose script used to independently parse the problem, scan the arc
+list by type, and build its own adjacency structures. The helpers here do
+that one-shot work once per process per problem, so a diagnostic sweep that
+imports several scripts (or calls several helpers) pays for each derived
+structure only once.
+"""
+
+import functools
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "opencg"))
+
+import numpy as np
+
+from opencg.core.arc import ArcType
+
+from _parse_cache import load_problem  # noqa: F401  (re-exported)
+
+
+def _per_problem(fn):
+    """Memoize fn(problem) by id(problem) for the life of the process.
+
+    Problems are parsed once and kept alive for the whole diagnostic run,
+    so id() is a stable key here.
+    """
+    cache = {}
+
+    @functools.wraps(fn)
+    def wrapper(problem):
+        key = id(problem)
+        if key not in cache:
+            cache[key] = fn(problem)
+        return cache[key]
+
+    return wrapper
+
+
+@_per_problem
+def get_arcs_by_type(problem):
+    """Single pass over the arcs, bucketed by ArcType."""
+    buckets = {}
+    for arc in problem.network.arcs:
+        buckets.setdefault(arc.arc_type, []).append(arc)
+    return buckets
+
+
+@_per_problem
+def get_flight_arcs(problem):
+    """Flight arcs keyed by arc index."""
+    return {a.index: a for a in get_arcs_by_type(problem).get(ArcType.FLIGHT, ())}
+
+
+@_per_problem
+def get_adjacency(problem):
+    """(outgoing, incoming) dicts of (arc_idx, other_node, arc_type) tuples."""
+    outgoing = {}
+    incoming = {}
+    # Bind setdefault once; the loop body then does one attribute fetch per
+    # Arc field instead of re-resolving methods on every insertion.
+    outgoing_sd = outgoing.setdefault
+    incoming_sd = incoming.setdefault
+    for arc in problem.network.arcs:
+        s = arc.source
+        t = arc.target
+        idx = arc.index
+        at = arc.arc_type
+        outgoing_sd(s, []).append((idx, t, at))
+        incoming_sd(t, []).append((idx, s, at))
+    return outgoing, incoming
+
+
+@_per_problem
+def get_csr(problem):
+    """CSR form of the arc graph with per-edge resource consumption.
+
+    Returns (indptr, indices, duty_cons, flight_cons, edge_arcs) where the
+    per-edge arrays are aligned with ``indices`` and ``edge_arcs`` maps each
+    edge slot back to its Arc object for path reporting.
+    """
+    arcs = problem.network.arcs
+    num_nodes = problem.network.num_nodes
+    num_arcs = len(arcs)
+    srcs = np.fromiter((a.source for a in arcs), dtype=np.int32, count=num_arcs)
+    tgts = np.fromiter((a.target for a in arcs), dtype=np.int32, count=num_arcs)
+    order = np.argsort(srcs, kind='stable')
+    indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.add.at(indptr, srcs + 1, 1)
+    np.cumsum(indptr, out=indptr)
+    indices = tgts[order]
+    duty_cons = np.fromiter(
+        (a.get_consumption('duty_time', 0) for a in arcs),
+        dtype=np.float64, count=num_arcs,
+    )[order]
+    flight_cons = np.fromiter(
+        (a.get_consumption('flight_time', 0) for a in arcs),
+        dtype=np.float64, count=num_arcs,
+    )[order]
+    edge_arcs = [arcs[i] for i in order]
+    return indptr, indices, duty_cons, flight_cons, edge_arcs
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Disk-backed cache for parsed Kasirzadeh problems.
+
+Parsing an instance is by far the dominant cost of the diagnose_* scripts,
+and interactive diagnosis reruns them against the same instance over and
+over. Cache the parsed problem to a pickle keyed by the parser options and
+the data files' modification times so reruns skip the parse entirely.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "opencg"))
+
+from opencg.parsers import KasirzadehParser
+from opencg.parsers.base import ParserConfig
+
+CACHE_DIR = Path("/tmp/opencg_cache")
+
+
+def load_problem(data_path, options):
+    """Parse data_path with the given parser options, using a pickle cache.
+
+    The cache key covers the instance path, the options and the newest
+    mtime of the instance's CSV files, so a different instance or an
+    edit to either invalidates the entry.
+    """
+    newest = max((p.stat().st_mtime for p in Path(data_path).rglob("*.csv")), default=0.0)
+    key = hashlib.sha1(
+        (str(data_path) + repr(sorted(options.items())) + str(newest)).encode()
+    ).hexdigest()
+    cache_file = CACHE_DIR / f"{key}.pkl"
+
+    if cache_file.exists():
+        try:
+            return pickle.loads(cache_file.read_bytes())
+        except Exception:
+            pass  # Corrupt or stale cache entry; fall through and re-parse
+
+    parser_config = ParserConfig(verbose=False, validate=True, options=dict(options))
+    problem = KasirzadehParser(parser_config).parse(data_path)
+
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(pickle.dumps(problem))
+    except Exception:
+        pass  # Caching is best-effort
+
+    return problem
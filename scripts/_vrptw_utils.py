@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Shared VRPTW instance helpers for the run_vrptw_* scripts.
+
+SmallVRPTWInstance and its supporting helpers used to be duplicated in
+run_vrptw_bp.py and run_vrptw_bpc.py, so every optimization had to be
+applied twice. Keeping them here means the precomputed matrices and the
+numba cache (when numba is installed) are shared too.
+"""
+
+import os
+import pickle
+import sys
+from collections import namedtuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "opencg"))
+
+import numpy as np
+
+from opencg.applications.vrp import VRPTWInstance
+
+# numba compiles the distance-matrix kernel; fall back to NumPy broadcasting
+# when unavailable
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def _dist_matrix(pts):
+        n = pts.shape[0]
+        out = np.empty((n, n), np.float64)
+        for i in range(n):
+            for j in range(n):
+                dx = pts[i, 0] - pts[j, 0]
+                dy = pts[i, 1] - pts[j, 1]
+                out[i, j] = (dx * dx + dy * dy) ** 0.5
+        return out
+
+
+def build_dist_matrix(pts):
+    """Full Euclidean distance matrix for an (n, 2) point array."""
+    if HAS_NUMBA:
+        return _dist_matrix(pts)
+    diff = pts[:, None, :] - pts[None, :, :]
+    return np.sqrt((diff * diff).sum(-1))
+
+
+# Structure-of-arrays form of an instance, consumable by compiled kernels
+# with fixed-shape signatures.
+_VRPTWSoA = namedtuple(
+    "_VRPTWSoA",
+    ["xy", "demands", "tw_early", "tw_late", "service", "dist", "tt", "capacity"],
+)
+
+
+class SmallVRPTWInstance:
+    """Wrapper to create a smaller instance from a larger one."""
+
+    def __init__(self, base_instance, num_customers=None):
+        if num_customers is None:
+            num_customers = base_instance.num_customers
+
+        self.name = f"{base_instance.name}_{num_customers}"
+        self.num_customers = num_customers
+        self.depot = base_instance.depot
+        self.customers = base_instance.customers[:num_customers]
+        self.demands = np.asarray(base_instance.demands[:num_customers], dtype=np.int64)
+        self.time_windows = base_instance.time_windows[:num_customers]
+        self.service_times = base_instance.service_times[:num_customers]
+        self.vehicle_capacity = base_instance.vehicle_capacity
+        self.depot_time_window = base_instance.depot_time_window
+        self.num_vehicles = base_instance.num_vehicles
+        self.total_demand = int(self.demands.sum())
+        self.speed = base_instance.speed
+
+        # Precompute the full distance/travel-time matrices once; pricing
+        # queries distance(i, j) O(n^2 * labels) times, so per-call Euclidean
+        # arithmetic would dominate the inner loop.
+        pts = np.asarray([self.depot] + list(self.customers), dtype=np.float64)
+        self._dist = build_dist_matrix(pts)
+        self._tt = self._dist / self.speed
+
+    def distance(self, i, j):
+        return self._dist[i, j]
+
+    def travel_time(self, i, j):
+        return self._tt[i, j]
+
+    def to_soa(self):
+        """Structure-of-arrays view for fixed-shape compiled pricing kernels."""
+        return _VRPTWSoA(
+            xy=np.asarray([self.depot] + list(self.customers), dtype=np.float64),
+            demands=np.asarray(self.demands, dtype=np.int64),
+            tw_early=np.asarray([tw[0] for tw in self.time_windows], dtype=np.float64),
+            tw_late=np.asarray([tw[1] for tw in self.time_windows], dtype=np.float64),
+            service=np.asarray(self.service_times, dtype=np.float64),
+            dist=self._dist,
+            tt=self._tt,
+            capacity=float(self.vehicle_capacity),
+        )
+
+
+def load_solomon_cached(instance_path):
+    """Load a Solomon instance through a pickle sidecar cache.
+
+    Re-parsing the text file on every invocation is pure overhead when
+    sweeping parameters; the sidecar is reused as long as it is newer than
+    the instance file. Caching is best-effort.
+    """
+    path = str(instance_path)
+    cache = path + ".pkl"
+    try:
+        if os.path.getmtime(cache) >= os.path.getmtime(path):
+            with open(cache, "rb") as fh:
+                return pickle.load(fh)
+    except (OSError, pickle.PickleError):
+        pass
+    instance = VRPTWInstance.from_solomon(path)
+    try:
+        with open(cache, "wb") as fh:
+            pickle.dump(instance, fh)
+    except OSError:
+        pass
+    return instance
+
+
+def attach_matrices(instance):
+    """Attach public dist_matrix/tt_matrix ndarrays to the instance.
+
+    Solvers that look for these can index them directly instead of making
+    O(n^2) distance() callbacks apiece.
+    """
+    d = getattr(instance, "_dist", None)
+    if d is None:
+        pts = np.asarray([instance.depot] + list(instance.customers), dtype=np.float64)
+        d = build_dist_matrix(pts)
+    instance.dist_matrix = d
+    instance.tt_matrix = d / instance.speed
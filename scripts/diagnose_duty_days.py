@@ -3,6 +3,8 @@
 Diagnose duty_days constraints for remaining uncovered flights.
 """
 
+import functools
+import io
 import sys
 import os
 
@@ -14,6 +16,11 @@ from opencg.parsers.base import ParserConfig
 from opencg.config import get_data_path
 from opencg.core.arc import ArcType
 
+# Diagnostic output is buffered and written to stdout in one shot at exit,
+# instead of one write-and-flush syscall per print.
+_OUT = io.StringIO()
+pr = functools.partial(print, file=_OUT)
+
 
 def main():
     data_path = get_data_path() / "kasirzadeh" / "instance1"
@@ -26,85 +33,97 @@ def main():
     # Problem flights
     problem_flights = [855, 873]
 
-    print("Flight details:")
+    pr("Flight details:")
     for idx in problem_flights:
         if idx < len(flights):
             f = flights[idx]
-            print(f"\nFlight {idx}: {f.leg_id}")
-            print(f"  Day: {f.day}")
-            print(f"  Departure: {f.dep_airport} at {f.dep_date} {f.dep_time}")
-            print(f"  Arrival: {f.arr_airport} at {f.arr_date} {f.arr_time}")
-            print(f"  Duration: {f.duration_hours:.2f}h")
+            pr(f"\nFlight {idx}: {f.leg_id}")
+            pr(f"  Day: {f.day}")
+            pr(f"  Departure: {f.dep_airport} at {f.dep_date} {f.dep_time}")
+            pr(f"  Arrival: {f.arr_airport} at {f.arr_date} {f.arr_time}")
+            pr(f"  Duration: {f.duration_hours:.2f}h")
 
     # Check what flights can directly connect to/from these
-    print("\n" + "="*70)
-    print("Looking for same-day connections...")
-    print("="*70)
+    pr("\n" + "="*70)
+    pr("Looking for same-day connections...")
+    pr("="*70)
+
+    # Index flights by airport once so each connection scan only looks at
+    # the matching bucket instead of every flight.
+    by_arr_airport = {}
+    by_dep_airport = {}
+    for i, f in enumerate(flights):
+        by_arr_airport.setdefault(f.arr_airport, []).append(i)
+        by_dep_airport.setdefault(f.dep_airport, []).append(i)
+
+    # _datetime_to_hours is pure; evaluate it once per flight up front
+    # instead of inside every connection scan.
+    arr_hours = [kparser._datetime_to_hours(f.arr_datetime) for f in flights]
+    dep_hours = [kparser._datetime_to_hours(f.dep_datetime) for f in flights]
 
     for idx in problem_flights:
         if idx >= len(flights):
             continue
 
         target = flights[idx]
-        print(f"\nFlight {idx} ({target.leg_id}):")
-        print(f"  Departs {target.dep_airport} at day {target.day}, {target.dep_time}")
-        print(f"  Arrives {target.arr_airport} at day {target.day}, {target.arr_time}")
+        pr(f"\nFlight {idx} ({target.leg_id}):")
+        pr(f"  Departs {target.dep_airport} at day {target.day}, {target.dep_time}")
+        pr(f"  Arrives {target.arr_airport} at day {target.day}, {target.arr_time}")
 
         # Find flights that could precede this one (same-day or day before)
         preceding = []
-        for i, f in enumerate(flights):
-            if f.arr_airport == target.dep_airport:
-                # Check connection time
-                arr_time = kparser._datetime_to_hours(f.arr_datetime)
-                dep_time = kparser._datetime_to_hours(target.dep_datetime)
-                conn = dep_time - arr_time
-
-                if 0.5 <= conn <= 4.0:  # Valid connection
-                    preceding.append((i, f, conn, "CONNECTION"))
-                elif 4.0 < conn <= 24.0:  # Valid layover
-                    preceding.append((i, f, conn, "OVERNIGHT"))
-
-        print(f"\n  Flights that can precede (arrive at {target.dep_airport}):")
+        for i in by_arr_airport.get(target.dep_airport, ()):
+            f = flights[i]
+            # Check connection time
+            conn = dep_hours[idx] - arr_hours[i]
+
+            if 0.5 <= conn <= 4.0:  # Valid connection
+                preceding.append((i, f, conn, "CONNECTION"))
+            elif 4.0 < conn <= 24.0:  # Valid layover
+                preceding.append((i, f, conn, "OVERNIGHT"))
+
+        pr(f"\n  Flights that can precede (arrive at {target.dep_airport}):")
         if not preceding:
-            print("    NONE!")
+            pr("    NONE!")
         else:
             for i, f, conn, conn_type in preceding[:10]:
-                print(f"    Flight {i} ({f.leg_id}): {f.arr_airport} day {f.day} {f.arr_time} -> conn={conn:.2f}h ({conn_type})")
+                pr(f"    Flight {i} ({f.leg_id}): {f.arr_airport} day {f.day} {f.arr_time} -> conn={conn:.2f}h ({conn_type})")
 
         # Find flights that could follow this one
         following = []
-        for i, f in enumerate(flights):
-            if f.dep_airport == target.arr_airport:
-                arr_time = kparser._datetime_to_hours(target.arr_datetime)
-                dep_time = kparser._datetime_to_hours(f.dep_datetime)
-                conn = dep_time - arr_time
-
-                if 0.5 <= conn <= 4.0:
-                    following.append((i, f, conn, "CONNECTION"))
-                elif 4.0 < conn <= 24.0:
-                    following.append((i, f, conn, "OVERNIGHT"))
-
-        print(f"\n  Flights that can follow (depart from {target.arr_airport}):")
+        for i in by_dep_airport.get(target.arr_airport, ()):
+            f = flights[i]
+            conn = dep_hours[i] - arr_hours[idx]
+
+            if 0.5 <= conn <= 4.0:
+                following.append((i, f, conn, "CONNECTION"))
+            elif 4.0 < conn <= 24.0:
+                following.append((i, f, conn, "OVERNIGHT"))
+
+        pr(f"\n  Flights that can follow (depart from {target.arr_airport}):")
         if not following:
-            print("    NONE!")
+            pr("    NONE!")
         else:
             for i, f, conn, conn_type in following[:10]:
-                print(f"    Flight {i} ({f.leg_id}): {f.dep_airport} day {f.day} {f.dep_time} -> conn={conn:.2f}h ({conn_type})")
+                pr(f"    Flight {i} ({f.leg_id}): {f.dep_airport} day {f.day} {f.dep_time} -> conn={conn:.2f}h ({conn_type})")
 
     # Check if these flights START or END at a base
     bases_file = data_path / "listOfBases.csv"
     bases = kparser._parse_bases(bases_file)
     base_airports = {b.name for b in bases if b.is_base}
-    print(f"\nBase airports: {base_airports}")
+    pr(f"\nBase airports: {base_airports}")
 
     for idx in problem_flights:
         if idx >= len(flights):
             continue
         f = flights[idx]
-        print(f"\nFlight {idx}:")
-        print(f"  Departs from {f.dep_airport}: {'BASE' if f.dep_airport in base_airports else 'not a base'}")
-        print(f"  Arrives at {f.arr_airport}: {'BASE' if f.arr_airport in base_airports else 'not a base'}")
+        pr(f"\nFlight {idx}:")
+        pr(f"  Departs from {f.dep_airport}: {'BASE' if f.dep_airport in base_airports else 'not a base'}")
+        pr(f"  Arrives at {f.arr_airport}: {'BASE' if f.arr_airport in base_airports else 'not a base'}")
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        sys.stdout.write(_OUT.getvalue())
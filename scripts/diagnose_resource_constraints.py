@@ -3,92 +3,147 @@
 Diagnose resource constraints for remaining uncovered flights.
 """
 
+import functools
+import io
 import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "opencg"))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from opencg.parsers import KasirzadehParser
-from opencg.parsers.base import ParserConfig
+import numpy as np
+
 from opencg.config import get_data_path
 from opencg.core.arc import ArcType
 
+from _diagnose_common import load_problem, get_arcs_by_type, get_flight_arcs, get_csr
+
+# Diagnostic output is buffered and written to stdout in one shot at exit,
+# instead of one write-and-flush syscall per print.
+_OUT = io.StringIO()
+pr = functools.partial(print, file=_OUT)
+
+# numba compiles the duty-limited BFS kernel; fall back to the interpreted
+# loop when unavailable
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+if HAS_NUMBA:
+    @njit(cache=True)
+    def _bfs_duty_limited(indptr, indices, duty_cons, start, start_duty, target_mask, cap):
+        """BFS over CSR arrays; returns duty at the first target reached, -1 if none."""
+        n_nodes = indptr.shape[0] - 1
+        visited = np.zeros(n_nodes, np.uint8)
+        visited[start] = 1
+        qnode = np.empty(n_nodes, np.int32)
+        qduty = np.empty(n_nodes, np.float64)
+        qnode[0] = start
+        qduty[0] = start_duty
+        head = 0
+        tail = 1
+        while head < tail:
+            n = qnode[head]
+            d = qduty[head]
+            head += 1
+            if target_mask[n]:
+                return d
+            for k in range(indptr[n], indptr[n + 1]):
+                t = indices[k]
+                if visited[t]:
+                    continue
+                nd = d + duty_cons[k]
+                if nd > cap:
+                    continue
+                visited[t] = 1
+                qnode[tail] = t
+                qduty[tail] = nd
+                tail += 1
+        return -1.0
+
 
 def main():
     data_path = get_data_path() / "kasirzadeh" / "instance1"
 
-    # Configure parser
-    parser_config = ParserConfig(
-        verbose=False,
-        validate=True,
-        options={
-            'min_connection_time': 0.5,
-            'max_connection_time': 4.0,
-            'min_layover_time': 4.0,
-            'max_layover_time': 24.0,
-            'max_duty_time': 14.0,
-            'max_pairing_days': 5,
-        }
-    )
-    kparser = KasirzadehParser(parser_config)
-    problem = kparser.parse(data_path)
-
-    print(f"Instance: {problem.name}")
-    print(f"Resources: {[r.name for r in problem.resources]}")
-    print()
+    # Parse (cached across reruns on the same instance)
+    problem = load_problem(data_path, {
+        'min_connection_time': 0.5,
+        'max_connection_time': 4.0,
+        'min_layover_time': 4.0,
+        'max_layover_time': 24.0,
+        'max_duty_time': 14.0,
+        'max_pairing_days': 5,
+    })
+
+    pr(f"Instance: {problem.name}")
+    pr(f"Resources: {[r.name for r in problem.resources]}")
+    pr()
 
     # Get resource limits
     for r in problem.resources:
         if hasattr(r, 'max_value'):
-            print(f"  {r.name}: max={r.max_value}")
+            pr(f"  {r.name}: max={r.max_value}")
 
     # Problem flights
     problem_flights = [855, 873]
 
     # Get flight arcs
-    flight_arcs = {}
-    for arc in problem.network.arcs:
-        if arc.arc_type == ArcType.FLIGHT:
-            flight_arcs[arc.index] = arc
-
-    # Build adjacency
-    outgoing = {}
-    incoming = {}
-    for arc in problem.network.arcs:
-        outgoing.setdefault(arc.source, []).append(arc)
-        incoming.setdefault(arc.target, []).append(arc)
+    flight_arcs = get_flight_arcs(problem)
 
-    # Get source and sink arcs
-    source_arcs = [a for a in problem.network.arcs if a.arc_type == ArcType.SOURCE_ARC]
-    sink_arcs = [a for a in problem.network.arcs if a.arc_type == ArcType.SINK_ARC]
+    # CSR adjacency with per-edge consumption, so BFS neighbor scans walk
+    # contiguous arrays instead of chasing dict -> list -> arc pointers.
+    indptr, indices, duty_cons, flight_cons, edge_arcs = get_csr(problem)
+    num_nodes = problem.network.num_nodes
 
-    print(f"\nSource arcs: {len(source_arcs)}")
-    print(f"Sink arcs: {len(sink_arcs)}")
+    # Get source and sink arcs
+    arcs_by_type = get_arcs_by_type(problem)
+    source_arcs = arcs_by_type.get(ArcType.SOURCE_ARC, [])
+    sink_arcs = arcs_by_type.get(ArcType.SINK_ARC, [])
+
+    pr(f"\nSource arcs: {len(source_arcs)}")
+    pr(f"Sink arcs: {len(sink_arcs)}")
+
+    # Map each base to the source nodes of its sink arcs once, so the inner
+    # BFS can test "can end at this base" with a single set lookup instead of
+    # an attribute fetch per SINK_ARC per expansion.
+    sink_nodes_for_base = {}
+    for a in sink_arcs:
+        sink_nodes_for_base.setdefault(a.get_attribute('base'), set()).add(a.source)
+
+    # Dense target masks for the JIT kernel
+    sink_mask_for_base = {}
+    if HAS_NUMBA:
+        for b, nodes in sink_nodes_for_base.items():
+            mask = np.zeros(num_nodes, dtype=np.uint8)
+            for n in nodes:
+                mask[n] = 1
+            sink_mask_for_base[b] = mask
 
     for flight_idx in problem_flights:
-        print(f"\n{'='*70}")
-        print(f"FLIGHT {flight_idx}")
-        print(f"{'='*70}")
+        pr(f"\n{'='*70}")
+        pr(f"FLIGHT {flight_idx}")
+        pr(f"{'='*70}")
 
         arc = flight_arcs.get(flight_idx)
         if not arc:
-            print("  Not found")
+            pr("  Not found")
             continue
 
-        print(f"Arc: node {arc.source} -> node {arc.target}")
-        print(f"Resources consumed by this flight:")
+        pr(f"Arc: node {arc.source} -> node {arc.target}")
+        pr(f"Resources consumed by this flight:")
         for r in problem.resources:
             val = arc.get_consumption(r.name, 0)
-            print(f"  {r.name}: {val:.2f}")
+            pr(f"  {r.name}: {val:.2f}")
 
         # Find shortest path from any source to this flight
-        print(f"\nFinding shortest paths to this flight...")
+        pr(f"\nFinding shortest paths to this flight...")
 
         # BFS from source arcs
         for src_arc in source_arcs[:3]:  # Check first 3 bases
             base = src_arc.get_attribute('base')
-            print(f"\n  From {base}:")
+            pr(f"\n  From {base}:")
 
             # BFS to find path to flight source
             start_node = src_arc.target
@@ -106,72 +161,86 @@ def main():
                     found_path = (path, duty, flight_time)
                     break
 
-                for next_arc in outgoing.get(node, []):
-                    next_node = next_arc.target
+                for k in range(indptr[node], indptr[node + 1]):
+                    next_node = indices[k]
                     if next_node in visited:
                         continue
 
-                    # Calculate new resource values
-                    new_duty = duty + next_arc.get_consumption('duty_time', 0)
-                    new_flight = flight_time + next_arc.get_consumption('flight_time', 0)
+                    # Calculate new resource values; check the duty limit
+                    # before paying for the flight-time add
+                    new_duty = duty + duty_cons[k]
 
                     # Skip if over limits (would be pruned by SPPRC)
                     if new_duty > 14.0:  # max_duty_time
                         continue
 
+                    new_flight = flight_time + flight_cons[k]
+
                     visited.add(next_node)
-                    queue.append((next_node, path + [next_arc], new_duty, new_flight))
+                    queue.append((next_node, path + [edge_arcs[k]], new_duty, new_flight))
 
                     if len(queue) > 10000:  # Limit search
                         break
 
             if found_path:
                 path, duty, flight_time = found_path
-                print(f"    Path found with {len(path)} arcs")
-                print(f"    Duty before flight: {duty:.2f}h")
-                print(f"    Flight time before: {flight_time:.2f}h")
+                pr(f"    Path found with {len(path)} arcs")
+                pr(f"    Duty before flight: {duty:.2f}h")
+                pr(f"    Flight time before: {flight_time:.2f}h")
 
                 # Add the target flight
                 total_duty = duty + arc.get_consumption('duty_time', 0)
-                print(f"    Duty after flight: {total_duty:.2f}h")
+                pr(f"    Duty after flight: {total_duty:.2f}h")
 
                 # Now check if we can reach a sink from the flight's arrival
-                print(f"    Checking path to sink...")
+                pr(f"    Checking path to sink...")
 
                 # BFS from flight arrival to sink
                 arr_node = arc.target
-                queue2 = [(arr_node, total_duty)]
-                visited2 = {arr_node}
                 found_sink = None
+                base_sink_nodes = sink_nodes_for_base.get(base, set())
+
+                if HAS_NUMBA and base in sink_mask_for_base:
+                    final = _bfs_duty_limited(
+                        indptr, indices, duty_cons,
+                        arr_node, total_duty, sink_mask_for_base[base], 14.0,
+                    )
+                    if final >= 0.0:
+                        found_sink = (arr_node, final)
+                else:
+                    queue2 = [(arr_node, total_duty)]
+                    visited2 = {arr_node}
 
-                while queue2 and not found_sink:
-                    node, duty = queue2.pop(0)
+                    while queue2 and not found_sink:
+                        node, duty = queue2.pop(0)
 
-                    for next_arc in outgoing.get(node, []):
-                        if next_arc.arc_type == ArcType.SINK_ARC:
-                            if next_arc.get_attribute('base') == base:
-                                found_sink = (next_arc, duty)
-                                break
+                        if node in base_sink_nodes:
+                            found_sink = (node, duty)
+                            break
 
-                        next_node = next_arc.target
-                        if next_node in visited2:
-                            continue
+                        for k in range(indptr[node], indptr[node + 1]):
+                            next_node = indices[k]
+                            if next_node in visited2:
+                                continue
 
-                        new_duty = duty + next_arc.get_consumption('duty_time', 0)
-                        if new_duty > 14.0:
-                            continue
+                            new_duty = duty + duty_cons[k]
+                            if new_duty > 14.0:
+                                continue
 
-                        visited2.add(next_node)
-                        queue2.append((next_node, new_duty))
+                            visited2.add(next_node)
+                            queue2.append((next_node, new_duty))
 
                 if found_sink:
-                    sink_arc, final_duty = found_sink
-                    print(f"    Can reach sink! Final duty: {final_duty:.2f}h")
+                    _, final_duty = found_sink
+                    pr(f"    Can reach sink! Final duty: {final_duty:.2f}h")
                 else:
-                    print(f"    CANNOT reach sink from {base} within duty limits!")
+                    pr(f"    CANNOT reach sink from {base} within duty limits!")
             else:
-                print(f"    No feasible path found to flight source")
+                pr(f"    No feasible path found to flight source")
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        sys.stdout.write(_OUT.getvalue())
@@ -3,46 +3,56 @@
 Diagnose why certain flights remain uncovered in crew pairing.
 """
 
+import functools
+import io
 import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "opencg"))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from opencg.parsers import KasirzadehParser
-from opencg.parsers.base import ParserConfig
 from opencg.config import get_data_path
 from opencg.core.arc import ArcType
 from opencg.applications.crew_pairing import solve_crew_pairing, CrewPairingConfig
 
+from _diagnose_common import load_problem, get_arcs_by_type, get_flight_arcs
+
+# Diagnostic output is buffered and written to stdout in one shot at exit,
+# instead of one write-and-flush syscall per print.
+_OUT = io.StringIO()
+pr = functools.partial(print, file=_OUT)
+
+# scipy gives a compiled BFS; fall back to pure Python when unavailable
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import breadth_first_order
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
 
 def main():
     data_path = get_data_path() / "kasirzadeh" / "instance1"
 
-    # Configure parser
-    parser_config = ParserConfig(
-        verbose=False,
-        validate=True,
-        options={
-            'min_connection_time': 0.5,
-            'max_connection_time': 4.0,
-            'min_layover_time': 4.0,  # Close the gap
-            'max_layover_time': 24.0,
-            'max_duty_time': 14.0,
-            'max_pairing_days': 5,
-        }
-    )
-    kparser = KasirzadehParser(parser_config)
-    problem = kparser.parse(data_path)
-
-    print(f"Instance: {problem.name}")
-    print(f"Flights: {len(problem.cover_constraints)}")
-    print(f"Network nodes: {problem.network.num_nodes}")
-    print(f"Network arcs: {problem.network.num_arcs}")
-    print()
+    # Parse (cached across reruns on the same instance)
+    problem = load_problem(data_path, {
+        'min_connection_time': 0.5,
+        'max_connection_time': 4.0,
+        'min_layover_time': 4.0,  # Close the gap
+        'max_layover_time': 24.0,
+        'max_duty_time': 14.0,
+        'max_pairing_days': 5,
+    })
+
+    pr(f"Instance: {problem.name}")
+    pr(f"Flights: {len(problem.cover_constraints)}")
+    pr(f"Network nodes: {problem.network.num_nodes}")
+    pr(f"Network arcs: {problem.network.num_arcs}")
+    pr()
 
     # Run CG
-    print("Running Column Generation...")
+    pr("Running Column Generation...")
     config = CrewPairingConfig(
         max_iterations=50,
         pricing_max_columns=200,
@@ -52,52 +62,73 @@ def main():
     )
     solution = solve_crew_pairing(problem, config)
 
-    print(f"Objective: {solution.objective:.2f}")
-    print(f"Coverage: {solution.coverage_pct:.1f}%")
-    print(f"Uncovered: {len(solution.uncovered_flights)}")
-    print()
+    pr(f"Objective: {solution.objective:.2f}")
+    pr(f"Coverage: {solution.coverage_pct:.1f}%")
+    pr(f"Uncovered: {len(solution.uncovered_flights)}")
+    pr()
 
     if not solution.uncovered_flights:
-        print("All flights covered!")
+        pr("All flights covered!")
         return
 
-    print("=" * 70)
-    print("Diagnosing uncovered flights")
-    print("=" * 70)
+    pr("=" * 70)
+    pr("Diagnosing uncovered flights")
+    pr("=" * 70)
 
     # Get flight arc info
-    flight_arcs = {}
+    flight_arcs = get_flight_arcs(problem)
+
+    # Get source/sink endpoints by base. Storing node ids (rather than arc
+    # objects) means the per-flight reachability loops below do no
+    # attribute access.
+    arcs_by_type = get_arcs_by_type(problem)
+    source_targets_by_base = {}
+    sink_sources_by_base = {}
+    for arc in arcs_by_type.get(ArcType.SOURCE_ARC, ()):
+        base = arc.get_attribute('base')
+        if base:
+            source_targets_by_base.setdefault(base, []).append(arc.target)
+    for arc in arcs_by_type.get(ArcType.SINK_ARC, ()):
+        base = arc.get_attribute('base')
+        if base:
+            sink_sources_by_base.setdefault(base, []).append(arc.source)
+
+    pr(f"Bases: {list(source_targets_by_base.keys())}")
+    pr()
+
+    # Assign each base a bit index so "roundtrip possible" per flight is a
+    # single AND of two int masks instead of building Python sets per flight.
+    base_bit = {base: 1 << i for i, base in enumerate(sorted(source_targets_by_base))}
+
+    # Adjacency for the mask propagation below (node ids only), with
+    # setdefault bound outside the loop.
+    outgoing = {}
+    incoming = {}
+    outgoing_sd = outgoing.setdefault
+    incoming_sd = incoming.setdefault
     for arc in problem.network.arcs:
-        if arc.arc_type == ArcType.FLIGHT:
-            flight_arcs[arc.index] = arc
+        s = arc.source
+        t = arc.target
+        outgoing_sd(s, []).append(t)
+        incoming_sd(t, []).append(s)
 
-    # Get source/sink arcs by base
-    source_arcs_by_base = {}
-    sink_arcs_by_base = {}
-    for arc in problem.network.arcs:
-        if arc.arc_type == ArcType.SOURCE_ARC:
-            base = arc.get_attribute('base')
-            if base:
-                source_arcs_by_base.setdefault(base, []).append(arc)
-        elif arc.arc_type == ArcType.SINK_ARC:
-            base = arc.get_attribute('base')
-            if base:
-                sink_arcs_by_base.setdefault(base, []).append(arc)
-
-    print(f"Bases: {list(source_arcs_by_base.keys())}")
-    print()
+    num_nodes = problem.network.num_nodes
+    # fwd_mask[n]: bases whose source arcs can reach node n.
+    # back_mask[n]: bases whose sink arcs are reachable from node n.
+    fwd_mask = propagate_base_masks(outgoing, source_targets_by_base, base_bit, num_nodes)
+    back_mask = propagate_base_masks(incoming, sink_sources_by_base, base_bit, num_nodes)
 
     # For each uncovered flight, analyze reachability
     for flight_idx in sorted(solution.uncovered_flights):
-        print(f"\n--- Flight {flight_idx} ---")
+        pr(f"\n--- Flight {flight_idx} ---")
 
         if flight_idx not in flight_arcs:
-            print(f"  WARNING: No arc for flight index {flight_idx}")
+            pr(f"  WARNING: No arc for flight index {flight_idx}")
             continue
 
         arc = flight_arcs[flight_idx]
-        print(f"  Arc: {arc.source} -> {arc.target}")
-        print(f"  Cost: {arc.cost:.2f}")
+        pr(f"  Arc: {arc.source} -> {arc.target}")
+        pr(f"  Cost: {arc.cost:.2f}")
 
         # Check attributes
         attrs = {}
@@ -105,7 +136,7 @@ def main():
             val = arc.get_attribute(attr)
             if val:
                 attrs[attr] = val
-        print(f"  Attributes: {attrs}")
+        pr(f"  Attributes: {attrs}")
 
         # Check resource consumption
         resources = {}
@@ -113,64 +144,74 @@ def main():
             val = arc.get_consumption(res.name, None)
             if val is not None:
                 resources[res.name] = val
-        print(f"  Resources: {resources}")
+        pr(f"  Resources: {resources}")
 
         # Find which bases have source arcs that can reach this flight's source node
-        print(f"  Checking reachability from bases...")
+        pr(f"  Checking reachability from bases...")
         flight_source_node = arc.source
         flight_target_node = arc.target
 
-        # Simple BFS from source arcs to flight source node
-        reachable_from = []
-        for base, base_source_arcs in source_arcs_by_base.items():
-            for src_arc in base_source_arcs:
-                # src_arc.target is where the source arc points to
-                if can_reach(problem.network, src_arc.target, flight_source_node):
-                    reachable_from.append(base)
-                    break
+        fwd = fwd_mask[flight_source_node]
+        back = back_mask[flight_target_node]
 
-        print(f"  Reachable from bases: {reachable_from}")
+        reachable_from = [b for b, bit in base_bit.items() if fwd & bit]
+        pr(f"  Reachable from bases: {reachable_from}")
 
         # Check if flight target can reach any sink
-        reachable_to = []
-        for base, base_sink_arcs in sink_arcs_by_base.items():
-            for snk_arc in base_sink_arcs:
-                # snk_arc.source is where sink arc originates
-                if can_reach(problem.network, flight_target_node, snk_arc.source):
-                    reachable_to.append(base)
-                    break
-
-        print(f"  Can reach sinks for: {reachable_to}")
+        reachable_to = [b for b, bit in base_bit.items() if back & bit]
+        pr(f"  Can reach sinks for: {reachable_to}")
 
         # Check if any base can both reach and return
-        roundtrip_bases = set(reachable_from) & set(reachable_to)
-        print(f"  Roundtrip possible from: {roundtrip_bases}")
-
-
-def can_reach(network, from_node, to_node, max_depth=50):
-    """BFS to check if to_node is reachable from from_node."""
-    if from_node == to_node:
-        return True
-
-    visited = {from_node}
-    frontier = [from_node]
-    depth = 0
-
-    while frontier and depth < max_depth:
-        depth += 1
-        next_frontier = []
-        for node in frontier:
-            # Find all outgoing arcs from this node
-            for arc in network.arcs:
-                if arc.source == node and arc.target not in visited:
-                    if arc.target == to_node:
-                        return True
-                    visited.add(arc.target)
-                    next_frontier.append(arc.target)
-        frontier = next_frontier
-
-    return False
+        rt_mask = fwd & back
+        roundtrip_bases = {b for b, bit in base_bit.items() if rt_mask & bit}
+        pr(f"  Roundtrip possible from: {roundtrip_bases}")
+
+
+def propagate_base_masks(adjacency, seeds_by_base, base_bit, num_nodes):
+    """BFS from each base's seed nodes, OR-ing that base's bit into every
+    node it reaches. Returns a per-node int bitmask of reaching bases."""
+    masks = [0] * num_nodes
+
+    if HAS_SCIPY:
+        # Compiled BFS over a CSR adjacency matrix
+        rows, cols = [], []
+        for src, targets in adjacency.items():
+            rows.extend([src] * len(targets))
+            cols.extend(targets)
+        csr = csr_matrix(
+            (np.ones(len(rows), dtype=np.int8), (rows, cols)),
+            shape=(num_nodes, num_nodes),
+        )
+        for base, seeds in seeds_by_base.items():
+            bit = base_bit[base]
+            for n in seeds:
+                if masks[n] & bit:
+                    continue
+                order = breadth_first_order(csr, n, return_predecessors=False)
+                for reached in order.tolist():
+                    masks[reached] |= bit
+        return masks
+
+    for base, seeds in seeds_by_base.items():
+        bit = base_bit[base]
+        frontier = []
+        for n in seeds:
+            if not masks[n] & bit:
+                masks[n] |= bit
+                frontier.append(n)
+        while frontier:
+            next_frontier = []
+            for node in frontier:
+                for nbr in adjacency.get(node, ()):
+                    if not masks[nbr] & bit:
+                        masks[nbr] |= bit
+                        next_frontier.append(nbr)
+            frontier = next_frontier
+    return masks
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        sys.stdout.write(_OUT.getvalue())
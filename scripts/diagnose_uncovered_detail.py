@@ -3,57 +3,83 @@
 Detailed diagnosis of isolated flights in the network.
 """
 
+import functools
+import io
 import sys
 import os
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "opencg"))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from opencg.parsers import KasirzadehParser
-from opencg.parsers.base import ParserConfig
 from opencg.config import get_data_path
 from opencg.core.arc import ArcType
 from opencg.core.node import NodeType
 
+from _diagnose_common import load_problem, get_adjacency, get_arcs_by_type, get_flight_arcs
+
+# Diagnostic output is buffered and written to stdout in one shot at exit,
+# instead of one write-and-flush syscall per print.
+_OUT = io.StringIO()
+pr = functools.partial(print, file=_OUT)
+
+# scipy gives a compiled BFS; fall back to pure Python when unavailable
+try:
+    import numpy as np
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import breadth_first_order, connected_components
+    HAS_SCIPY = True
+except ImportError:
+    HAS_SCIPY = False
+
+
+def weak_component_labels(outgoing, incoming, num_nodes):
+    """Label each node with its weakly-connected component (pure Python)."""
+    labels = [-1] * num_nodes
+    comp = 0
+    for seed in range(num_nodes):
+        if labels[seed] != -1:
+            continue
+        labels[seed] = comp
+        frontier = [seed]
+        while frontier:
+            next_frontier = []
+            for n in frontier:
+                for _, other, _at in outgoing.get(n, ()):
+                    if labels[other] == -1:
+                        labels[other] = comp
+                        next_frontier.append(other)
+                for _, other, _at in incoming.get(n, ()):
+                    if labels[other] == -1:
+                        labels[other] = comp
+                        next_frontier.append(other)
+            frontier = next_frontier
+        comp += 1
+    return labels
+
 
 def main():
     data_path = get_data_path() / "kasirzadeh" / "instance1"
 
-    # Configure parser
-    parser_config = ParserConfig(
-        verbose=False,
-        validate=True,
-        options={
-            'min_connection_time': 0.5,
-            'max_connection_time': 4.0,
-            'min_layover_time': 10.0,
-            'max_layover_time': 24.0,
-            'max_duty_time': 14.0,
-            'max_pairing_days': 5,
-        }
-    )
-    kparser = KasirzadehParser(parser_config)
-    problem = kparser.parse(data_path)
+    # Parse (cached across reruns on the same instance)
+    problem = load_problem(data_path, {
+        'min_connection_time': 0.5,
+        'max_connection_time': 4.0,
+        'min_layover_time': 10.0,
+        'max_layover_time': 24.0,
+        'max_duty_time': 14.0,
+        'max_pairing_days': 5,
+    })
 
     network = problem.network
 
     # Find problem flights
     problem_flights = [870, 882]
 
-    # Build adjacency info
-    outgoing = {}  # node -> list of (arc_idx, target_node, arc_type)
-    incoming = {}  # node -> list of (arc_idx, source_node, arc_type)
-
-    for arc in network.arcs:
-        s, t = arc.source, arc.target
-        outgoing.setdefault(s, []).append((arc.index, t, arc.arc_type))
-        incoming.setdefault(t, []).append((arc.index, s, arc.arc_type))
+    # Adjacency info: node -> list of (arc_idx, other_node, arc_type)
+    outgoing, incoming = get_adjacency(problem)
 
     # Find flight arcs
-    flight_arcs = {}
-    for arc in network.arcs:
-        if arc.arc_type == ArcType.FLIGHT:
-            flight_arcs[arc.index] = arc
+    flight_arcs = get_flight_arcs(problem)
 
     # Find sink nodes
     sink_nodes = set()
@@ -62,81 +88,122 @@ def main():
         if node and node.node_type == NodeType.SINK:
             sink_nodes.add(i)
 
-    print("=" * 70)
-    print("Detailed Flight Analysis")
-    print("=" * 70)
+    # CSR form of the arc graph for scipy's compiled BFS
+    csr = None
+    if HAS_SCIPY:
+        rows = [a.source for a in network.arcs]
+        cols = [a.target for a in network.arcs]
+        csr = csr_matrix(
+            (np.ones(len(rows), dtype=np.int8), (rows, cols)),
+            shape=(network.num_nodes, network.num_nodes),
+        )
+
+    # Weakly-connected component labels, computed once. Nodes in different
+    # components can never reach each other, so the reachability checks below
+    # can answer "no" in O(1) without running any BFS.
+    if csr is not None:
+        _, labels = connected_components(csr, directed=True, connection='weak')
+    else:
+        labels = weak_component_labels(outgoing, incoming, network.num_nodes)
+    sink_comps = {labels[n] for n in sink_nodes}
+
+    pr("=" * 70)
+    pr("Detailed Flight Analysis")
+    pr("=" * 70)
 
     for flight_idx in problem_flights:
-        print(f"\n=== FLIGHT {flight_idx} ===")
+        pr(f"\n=== FLIGHT {flight_idx} ===")
 
         if flight_idx not in flight_arcs:
-            print("  Not found")
+            pr("  Not found")
             continue
 
         arc = flight_arcs[flight_idx]
         src, tgt = arc.source, arc.target
 
-        print(f"Arc: node {src} -> node {tgt}")
+        pr(f"Arc: node {src} -> node {tgt}")
 
         # What can reach the source node?
-        print(f"\n  Incoming to node {src} (flight source):")
+        pr(f"\n  Incoming to node {src} (flight source):")
         inc = incoming.get(src, [])
         if not inc:
-            print("    NONE - this flight has no incoming connections!")
+            pr("    NONE - this flight has no incoming connections!")
         else:
             for arc_idx, from_node, arc_type in inc[:10]:
-                print(f"    Arc {arc_idx}: from node {from_node}, type={arc_type.name}")
+                pr(f"    Arc {arc_idx}: from node {from_node}, type={arc_type.name}")
             if len(inc) > 10:
-                print(f"    ... and {len(inc)-10} more")
+                pr(f"    ... and {len(inc)-10} more")
 
         # What can the target node reach?
-        print(f"\n  Outgoing from node {tgt} (flight target):")
+        pr(f"\n  Outgoing from node {tgt} (flight target):")
         out = outgoing.get(tgt, [])
         if not out:
-            print("    NONE - this flight has no outgoing connections!")
+            pr("    NONE - this flight has no outgoing connections!")
         else:
             for arc_idx, to_node, arc_type in out[:10]:
-                print(f"    Arc {arc_idx}: to node {to_node}, type={arc_type.name}")
+                pr(f"    Arc {arc_idx}: to node {to_node}, type={arc_type.name}")
             if len(out) > 10:
-                print(f"    ... and {len(out)-10} more")
+                pr(f"    ... and {len(out)-10} more")
 
         # For flight 870, check if any outgoing eventually reaches a sink
         if flight_idx == 870:
-            print(f"\n  Checking if any path from node {tgt} reaches a sink...")
-            visited = {tgt}
-            frontier = [tgt]
-            depth = 0
-            found_sink = False
-            while frontier and depth < 100:
-                depth += 1
-                next_frontier = []
-                for n in frontier:
-                    for _, to_node, at in outgoing.get(n, []):
-                        if to_node in sink_nodes:
-                            print(f"    Found sink node {to_node} at depth {depth}")
-                            found_sink = True
-                        elif at == ArcType.SINK_ARC:
-                            print(f"    Found SINK_ARC at depth {depth} to node {to_node}")
-                            found_sink = True
-                        if to_node not in visited:
-                            visited.add(to_node)
-                            next_frontier.append(to_node)
-                frontier = next_frontier
-            if not found_sink:
-                print(f"    NO path to any sink! Searched {len(visited)} nodes")
+            pr(f"\n  Checking if any path from node {tgt} reaches a sink...")
+            if labels[tgt] not in sink_comps:
+                pr(f"    Flight is in a component with no sinks (component {labels[tgt]}) - no BFS needed")
+            elif csr is not None:
+                reached = set(breadth_first_order(csr, tgt, return_predecessors=False).tolist())
+                hit = reached & sink_nodes
+                if hit:
+                    pr(f"    Found sink node(s) {sorted(hit)[:5]} among {len(reached)} reachable nodes")
+                else:
+                    pr(f"    NO path to any sink! Searched {len(reached)} nodes")
+            else:
+                visited = {tgt}
+                frontier = [tgt]
+                depth = 0
+                found_sink = False
+                while frontier and depth < 100:
+                    depth += 1
+                    next_frontier = []
+                    for n in frontier:
+                        for _, to_node, at in outgoing.get(n, []):
+                            if to_node in sink_nodes:
+                                pr(f"    Found sink node {to_node} at depth {depth}")
+                                found_sink = True
+                            elif at == ArcType.SINK_ARC:
+                                pr(f"    Found SINK_ARC at depth {depth} to node {to_node}")
+                                found_sink = True
+                            if to_node not in visited:
+                                visited.add(to_node)
+                                next_frontier.append(to_node)
+                    frontier = next_frontier
+                if not found_sink:
+                    pr(f"    NO path to any sink! Searched {len(visited)} nodes")
 
         # For flight 882, check if any base can reach its source
         if flight_idx == 882:
-            print(f"\n  Checking if any source arc reaches node {src}...")
+            pr(f"\n  Checking if any source arc reaches node {src}...")
             # Find source arcs
-            source_arcs = [a for a in network.arcs if a.arc_type == ArcType.SOURCE_ARC]
-            print(f"    Found {len(source_arcs)} source arcs total")
+            source_arcs = get_arcs_by_type(problem).get(ArcType.SOURCE_ARC, [])
+            pr(f"    Found {len(source_arcs)} source arcs total")
 
             # BFS from each source arc
             for src_arc in source_arcs[:5]:  # Check first 5
                 base = src_arc.get_attribute('base')
                 start = src_arc.target  # Where the source arc leads to
-                print(f"    Checking from {base} (source arc -> node {start})...")
+                pr(f"    Checking from {base} (source arc -> node {start})...")
+
+                if labels[start] != labels[src]:
+                    pr(f"      Not reachable (different weak components) - no BFS needed")
+                    continue
+
+                if csr is not None:
+                    reached = breadth_first_order(csr, start, return_predecessors=False)
+                    if src in reached:
+                        pr(f"      FOUND (searched {reached.shape[0]} nodes)")
+                    else:
+                        pr(f"      Not reachable from this source (searched {reached.shape[0]} nodes)")
+                    continue
 
                 visited = {start}
                 frontier = [start]
@@ -148,7 +215,7 @@ def main():
                     for n in frontier:
                         for _, to_node, at in outgoing.get(n, []):
                             if to_node == src:
-                                print(f"      FOUND at depth {depth}")
+                                pr(f"      FOUND at depth {depth}")
                                 found = True
                                 break
                             if to_node not in visited:
@@ -160,8 +227,11 @@ def main():
                         break
                     frontier = next_frontier
                 if not found:
-                    print(f"      Not reachable from this source (searched {len(visited)} nodes)")
+                    pr(f"      Not reachable from this source (searched {len(visited)} nodes)")
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        sys.stdout.write(_OUT.getvalue())
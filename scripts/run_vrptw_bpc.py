@@ -12,47 +12,43 @@ Examples:
 
 import sys
 import os
+
+# Pin BLAS/OpenMP pools to one thread before any numeric imports; the
+# solvers manage their own parallelism and auto-sized pools oversubscribe.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
 import time
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+
 # Add paths for development
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "opencg"))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from opencg.applications.vrp import VRPTWInstance, solve_vrptw, VRPTWConfig
-from opencg.config import get_data_path
-from openbp.applications.vrptw import solve_vrptw_bp, VRPTWBPConfig
-from openbp.applications.vrptw_bpc import solve_vrptw_bpc, VRPTWBPCConfig
-
-
-class SmallVRPTWInstance:
-    """Wrapper to create a smaller instance from a larger one."""
+def _timed_solve(solver, instance, config):
+    """Run solver(instance, config) and time it inside the worker process."""
+    start = time.perf_counter()
+    solution = solver(instance, config)
+    return solution, time.perf_counter() - start
 
-    def __init__(self, base_instance, num_customers=None):
-        if num_customers is None:
-            num_customers = base_instance.num_customers
 
-        self.name = f"{base_instance.name}_{num_customers}"
-        self.num_customers = num_customers
-        self.depot = base_instance.depot
-        self.customers = base_instance.customers[:num_customers]
-        self.demands = base_instance.demands[:num_customers]
-        self.time_windows = base_instance.time_windows[:num_customers]
-        self.service_times = base_instance.service_times[:num_customers]
-        self.vehicle_capacity = base_instance.vehicle_capacity
-        self.depot_time_window = base_instance.depot_time_window
-        self.num_vehicles = base_instance.num_vehicles
-        self.total_demand = sum(self.demands)
-        self.speed = base_instance.speed
+def _positive_int(value):
+    """argparse type= converter that rejects non-positive integers."""
+    ivalue = int(value)
+    if ivalue <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value!r}")
+    return ivalue
 
-    def distance(self, i, j):
-        loc_i = self.depot if i == 0 else self.customers[i - 1]
-        loc_j = self.depot if j == 0 else self.customers[j - 1]
-        return ((loc_i[0] - loc_j[0])**2 + (loc_i[1] - loc_j[1])**2)**0.5
 
-    def travel_time(self, i, j):
-        return self.distance(i, j) / self.speed
+def _positive_float(value):
+    """argparse type= converter that rejects non-positive numbers."""
+    fvalue = float(value)
+    if fvalue <= 0:
+        raise argparse.ArgumentTypeError(f"expected a positive number, got {value!r}")
+    return fvalue
 
 
 def print_header(title):
@@ -75,13 +71,22 @@ def main():
                         help="Instance file name (default: RC101.txt)")
     parser.add_argument("num_customers", nargs="?", type=int, default=25,
                         help="Number of customers (default: 25)")
-    parser.add_argument("--max-nodes", type=int, default=200,
+    parser.add_argument("--max-nodes", type=_positive_int, default=200,
                         help="Maximum B&B nodes (default: 200)")
-    parser.add_argument("--max-time", type=float, default=300.0,
+    parser.add_argument("--max-time", type=_positive_float, default=300.0,
                         help="Maximum time in seconds (default: 300)")
 
     args = parser.parse_args()
 
+    # Heavy solver imports happen only after argument parsing so --help and
+    # bad-argument failures stay fast.
+    from opencg.applications.vrp import solve_vrptw, VRPTWConfig
+    from opencg.config import get_data_path
+    from openbp.applications.vrptw import solve_vrptw_bp, VRPTWBPConfig
+    from openbp.applications.vrptw_bpc import solve_vrptw_bpc, VRPTWBPCConfig
+
+    from _vrptw_utils import SmallVRPTWInstance, attach_matrices, load_solomon_cached
+
     print_header("VRPTW: B&P vs Branch-Price-and-Cut Comparison")
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
@@ -93,13 +98,16 @@ def main():
 
     print(f"Instance file: {instance_path}")
 
-    base_instance = VRPTWInstance.from_solomon(str(instance_path))
+    base_instance = load_solomon_cached(instance_path)
 
     if args.num_customers < base_instance.num_customers:
         instance = SmallVRPTWInstance(base_instance, args.num_customers)
     else:
         instance = base_instance
 
+    # Build the shared distance/travel-time matrices once for all solvers
+    attach_matrices(instance)
+
     print(f"Instance: {instance.name}")
     print(f"  Customers: {instance.num_customers}")
     print(f"  Vehicle capacity: {instance.vehicle_capacity}")
@@ -108,9 +116,9 @@ def main():
     # Step 1: Column Generation baseline
     print_section("Step 1: Column Generation (OpenCG)")
 
-    cg_start = time.time()
+    cg_start = time.perf_counter()
     cg_sol = solve_vrptw(instance, VRPTWConfig(max_iterations=100, verbose=False))
-    cg_time = time.time() - cg_start
+    cg_time = time.perf_counter() - cg_start
 
     print(f"  LP Objective: {cg_sol.total_distance:.2f}")
     print(f"  IP Objective: {cg_sol.total_distance_ip:.2f}")
@@ -118,30 +126,23 @@ def main():
     print(f"  Integrality Gap: {cg_gap:.2f}%")
     print(f"  Time: {cg_time:.2f}s")
 
-    # Step 2: B&P (no cuts)
-    print_section("Step 2: Branch-and-Price (no cuts)")
+    # Steps 2 & 3: B&P and BPC operate on the same immutable instance, so run
+    # them in parallel processes (the GIL would serialize threads). Wall time
+    # becomes max(t_BP, t_BPC) instead of the sum.
+    print_section("Steps 2 & 3: B&P (no cuts) vs BPC (capacity cuts), in parallel")
+
+    # Hand matrix-aware backends a structure-of-arrays view of the instance
+    soa = instance.to_soa() if hasattr(instance, "to_soa") else None
+    extra = {'soa': soa} if soa is not None else {}
 
     bp_config = VRPTWBPConfig(
         max_time=args.max_time,
         max_nodes=args.max_nodes,
         verbose=True,
+        extra=extra,
+        initial_columns=cg_sol.routes,
     )
 
-    bp_start = time.time()
-    bp_sol = solve_vrptw_bp(instance, bp_config)
-    bp_time = time.time() - bp_start
-
-    print()
-    print(f"B&P Results:")
-    print(f"  Objective: {bp_sol.objective:.2f}")
-    print(f"  Lower Bound: {bp_sol.lower_bound:.2f}")
-    print(f"  Gap: {bp_sol.gap*100:.2f}%")
-    print(f"  Nodes: {bp_sol.nodes_explored}")
-    print(f"  Time: {bp_time:.2f}s")
-
-    # Step 3: BPC (with cuts)
-    print_section("Step 3: Branch-Price-and-Cut (with capacity cuts)")
-
     bpc_config = VRPTWBPCConfig(
         max_time=args.max_time,
         max_nodes=args.max_nodes,
@@ -150,11 +151,23 @@ def main():
         min_violation=0.1,
         max_subset_size=8,
         verbose=True,
+        extra=extra,
+        initial_columns=cg_sol.routes,
     )
 
-    bpc_start = time.time()
-    bpc_sol = solve_vrptw_bpc(instance, bpc_config)
-    bpc_time = time.time() - bpc_start
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        bp_future = pool.submit(_timed_solve, solve_vrptw_bp, instance, bp_config)
+        bpc_future = pool.submit(_timed_solve, solve_vrptw_bpc, instance, bpc_config)
+        bp_sol, bp_time = bp_future.result()
+        bpc_sol, bpc_time = bpc_future.result()
+
+    print()
+    print(f"B&P Results:")
+    print(f"  Objective: {bp_sol.objective:.2f}")
+    print(f"  Lower Bound: {bp_sol.lower_bound:.2f}")
+    print(f"  Gap: {bp_sol.gap*100:.2f}%")
+    print(f"  Nodes: {bp_sol.nodes_explored}")
+    print(f"  Time: {bp_time:.2f}s")
 
     print()
     print(f"BPC Results:")
@@ -168,25 +181,30 @@ def main():
     # Summary
     print_header("Summary Comparison")
 
-    print(f"{'Metric':<25} {'CG':<15} {'B&P':<15} {'BPC':<15}")
-    print("-" * 70)
-    print(f"{'LP Bound':<25} {cg_sol.total_distance:<15.2f} {'-':<15} {'-':<15}")
-    print(f"{'Objective':<25} {cg_sol.total_distance_ip:<15.2f} {bp_sol.objective:<15.2f} {bpc_sol.objective:<15.2f}")
-    print(f"{'Lower Bound':<25} {cg_sol.total_distance:<15.2f} {bp_sol.lower_bound:<15.2f} {bpc_sol.lower_bound:<15.2f}")
-    print(f"{'Gap (%)':<25} {cg_gap:<15.2f} {bp_sol.gap*100:<15.2f} {bpc_sol.gap*100:<15.2f}")
-    print(f"{'Nodes':<25} {1:<15} {bp_sol.nodes_explored:<15} {bpc_sol.nodes_explored:<15}")
-    print(f"{'Cuts':<25} {0:<15} {0:<15} {getattr(bpc_sol, 'total_cuts', 0):<15}")
-    print(f"{'Time (s)':<25} {cg_time:<15.2f} {bp_time:<15.2f} {bpc_time:<15.2f}")
+    # Emit the table in one write instead of one syscall per row
+    lines = [
+        f"{'Metric':<25} {'CG':<15} {'B&P':<15} {'BPC':<15}",
+        "-" * 70,
+        f"{'LP Bound':<25} {cg_sol.total_distance:<15.2f} {'-':<15} {'-':<15}",
+        f"{'Objective':<25} {cg_sol.total_distance_ip:<15.2f} {bp_sol.objective:<15.2f} {bpc_sol.objective:<15.2f}",
+        f"{'Lower Bound':<25} {cg_sol.total_distance:<15.2f} {bp_sol.lower_bound:<15.2f} {bpc_sol.lower_bound:<15.2f}",
+        f"{'Gap (%)':<25} {cg_gap:<15.2f} {bp_sol.gap*100:<15.2f} {bpc_sol.gap*100:<15.2f}",
+        f"{'Nodes':<25} {1:<15} {bp_sol.nodes_explored:<15} {bpc_sol.nodes_explored:<15}",
+        f"{'Cuts':<25} {0:<15} {0:<15} {getattr(bpc_sol, 'total_cuts', 0):<15}",
+        f"{'Time (s)':<25} {cg_time:<15.2f} {bp_time:<15.2f} {bpc_time:<15.2f}",
+        "",
+    ]
 
     # Analysis
-    print()
     if bpc_sol.nodes_explored < bp_sol.nodes_explored:
         reduction = (1 - bpc_sol.nodes_explored / bp_sol.nodes_explored) * 100
-        print(f"*** Cuts reduced nodes by {reduction:.1f}%")
+        lines.append(f"*** Cuts reduced nodes by {reduction:.1f}%")
     elif bpc_sol.nodes_explored > bp_sol.nodes_explored:
-        print(f"*** B&P explored fewer nodes (cuts didn't help for this instance)")
+        lines.append(f"*** B&P explored fewer nodes (cuts didn't help for this instance)")
     else:
-        print(f"*** Same number of nodes explored")
+        lines.append(f"*** Same number of nodes explored")
+
+    print("\n".join(lines))
 
     print()
     print("=" * 70)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the 855/873/909 path diagnostics.
+
+Parses instance1 once and dispatches to the BFS reachability check
+(test_specific_path) and/or the step-by-step trace (verify_full_path),
+so running both analyses pays the parse cost once.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "opencg"))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+# Same relaxed constraints both scripts use standalone, so all three entry
+# points share one disk-cache entry.
+PARSER_OPTIONS = {
+    'min_connection_time': 0.5,
+    'max_connection_time': 4.0,
+    'min_layover_time': 4.0,
+    'max_layover_time': 24.0,
+    'max_duty_time': 14.0,
+    'max_flight_time': 10.0,
+    'max_pairing_days': 7,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the 855/873/909 path diagnostics over one parsed problem"
+    )
+    parser.add_argument("--mode", choices=("bfs", "trace", "both"), default="both",
+                        help="bfs: reachability search; trace: step-by-step "
+                             "resource trace; both (default): run both")
+    args = parser.parse_args()
+
+    from opencg.config import get_data_path
+
+    import test_specific_path
+    import verify_full_path
+    from _parse_cache import load_problem
+
+    data_path = get_data_path() / "kasirzadeh" / "instance1"
+    problem = load_problem(data_path, PARSER_OPTIONS)
+
+    if args.mode in ("bfs", "both"):
+        test_specific_path.main(problem)
+    if args.mode in ("trace", "both"):
+        print()
+        verify_full_path.main(problem)
+
+
+if __name__ == "__main__":
+    main()
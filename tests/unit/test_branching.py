@@ -1,10 +1,12 @@
 """Tests for branching strategies."""
 
+import sys
+
 import pytest
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import FrozenSet, Tuple
 
-from openbp.branching.base import BranchingStrategy, BranchingCandidate
+from openbp.branching.base import BranchingStrategy, BranchingCandidate, CandidateBatch
 from openbp.branching.variable import VariableBranching
 from openbp.branching.ryan_foster import RyanFosterBranching
 from openbp.branching.arc import ArcBranching
@@ -18,8 +20,13 @@ except ImportError:
     from openbp.core.node import BranchType, BranchingDecision
 
 
-# Mock Column class for testing
-@dataclass(frozen=True)
+# Mock Column class for testing. Slotted where supported (dataclass
+# slots=True needs 3.10; the package floor is 3.9) so the many instances
+# the tests build skip the per-instance __dict__.
+_SLOTS_KW = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS_KW)
 class MockColumn:
     """Mock column for testing branching strategies."""
     arc_indices: Tuple[int, ...]
@@ -27,6 +34,14 @@ class MockColumn:
     covered_items: FrozenSet[int]
     value: float = 0.0
     source_node: int = 0
+    # Bitmask mirror of covered_items; filter_columns uses it for O(1)
+    # pair tests when present
+    covered_mask: int = field(init=False, default=0)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "covered_mask", sum(1 << i for i in self.covered_items)
+        )
 
 
 class TestVariableBranching:
@@ -44,17 +59,17 @@ class TestVariableBranching:
         ]
         column_values = [0.5, 1.0, 0.3]  # First and third are fractional
 
-        candidates = strategy.select_branching_candidates(
+        batch = strategy.select_branching_candidates_batch(
             node, columns, column_values, {}
         )
 
-        assert len(candidates) == 2
+        assert len(batch) == 2
 
-        # Check that candidates have correct structure
-        for c in candidates:
-            assert len(c.decisions) == 2
-            assert c.decisions[0].type == BranchType.VARIABLE
-            assert c.decisions[1].type == BranchType.VARIABLE
+        # Check structure over the whole batch at once
+        assert batch.types.shape == (2, 2)
+        assert (batch.types == CandidateBatch.type_code(BranchType.VARIABLE)).all()
+        # One up-branch and one down-branch per candidate
+        assert (batch.is_upper.sum(axis=1) == 1).all()
 
     def test_prefer_balanced_fractionality(self):
         """Test that balanced fractionality is preferred."""
@@ -186,6 +201,27 @@ class TestRyanFosterBranching:
         # Should remove: col1 (both)
         assert len(filtered) == 3
 
+    def test_filter_columns_without_mask(self):
+        """Columns lacking a covered_mask fall back to set membership."""
+        strategy = RyanFosterBranching()
+
+        class PlainColumn:
+            def __init__(self, covered_items):
+                self.covered_items = covered_items
+
+        columns = [
+            PlainColumn(frozenset({1, 2})),
+            PlainColumn(frozenset({1})),
+            PlainColumn(frozenset({3})),
+        ]
+
+        decision = BranchingDecision.ryan_foster(1, 2, True)
+
+        filtered = strategy.filter_columns(columns, [decision])
+
+        # Keep both-or-neither, drop the only-item-1 column
+        assert len(filtered) == 2
+
     def test_is_applicable(self):
         """Test applicability check."""
         strategy = RyanFosterBranching()